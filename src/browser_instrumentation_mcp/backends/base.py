@@ -95,13 +95,32 @@ class BrowserBackend(ABC):
         pass
 
     @abstractmethod
-    async def screenshot(self, session: str, full_page: bool = False) -> bytes:
-        """Take screenshot. Returns PNG bytes."""
+    async def screenshot(
+        self,
+        session: str,
+        full_page: bool = False,
+        image_format: str = "png",
+        quality: Optional[int] = None,
+        clip: Optional[dict] = None,
+    ) -> bytes:
+        """Take screenshot. Returns image bytes (PNG by default).
+
+        clip restricts capture to a region: {x, y, width, height} in CSS pixels.
+        """
         pass
 
     @abstractmethod
-    async def get_dom(self, session: str, selector: Optional[str] = None) -> dict:
-        """Get DOM HTML. Returns html, truncated flag, original_length."""
+    async def get_dom(
+        self,
+        session: str,
+        selector: Optional[str] = None,
+        length_only: bool = False,
+    ) -> dict:
+        """Get DOM HTML. Returns html, truncated flag, original_length.
+
+        With length_only, no HTML is returned; original_length carries the
+        size so callers can cheaply detect DOM growth.
+        """
         pass
 
     @abstractmethod
@@ -110,13 +129,25 @@ class BrowserBackend(ABC):
         pass
 
     @abstractmethod
-    async def get_console_logs(self, session: str) -> list[dict]:
-        """Get captured console log entries."""
+    async def get_console_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
+        """Get captured console log entries.
+
+        Each entry carries a "seq" number. Pass the highest seq seen as
+        since_seq to fetch only entries captured after it.
+        """
         pass
 
     @abstractmethod
-    async def get_network_logs(self, session: str) -> list[dict]:
-        """Get captured network request entries."""
+    async def get_network_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
+        """Get captured network request entries.
+
+        Each entry carries a "seq" number. Pass the highest seq seen as
+        since_seq to fetch only entries captured after it.
+        """
         pass
 
     # =========================================================================
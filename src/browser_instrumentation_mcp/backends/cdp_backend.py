@@ -1,8 +1,15 @@
 """Playwright CDP-based browser instrumentation backend."""
 
 import asyncio
+import re
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import suppress
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
+from itertools import islice
 from typing import Optional
 
 from playwright.async_api import (
@@ -15,19 +22,123 @@ from playwright.async_api import (
     Response,
     async_playwright,
 )
+from playwright.async_api import CDPSession as PlaywrightCDPSession
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from ..models import (
     ActionResult,
+    ClickDetails,
     Confidence,
     Event,
     EventLog,
     EventType,
+    ExecuteDetails,
+    ImageFormat,
     ObservedChanges,
     PrePostState,
     SessionStatus,
+    TypeDetails,
 )
 from .base import BrowserBackend
 
+# Resolved once at import; not every Playwright release has Browser.disconnect
+_BROWSER_DISCONNECT = getattr(Browser, "disconnect", None)
+
+# Default ring-buffer capacity for captured console/network entries per session
+DEFAULT_MAX_LOG_ENTRIES = 10_000
+
+# How often buffered events are committed to their session logs (seconds)
+DEFAULT_EVENT_FLUSH_INTERVAL = 2.0
+
+# Minimum wait after an action, so page events it triggered have time to
+# arrive from the browser before the post-state is read
+_SETTLE_GRACE = 0.05
+
+# Upper bound on how long to wait for an action's requests to finish
+_SETTLE_TIMEOUT = 0.1
+
+# Playwright auto-wait cap for actionability checks and post-navigation loads (ms)
+_ACTION_TIMEOUT_MS = 5000
+
+# A bare expression so it can go straight to Runtime.evaluate
+_SNAPSHOT_SCRIPT = "({url: location.href, title: document.title, mutations: 0})"
+
+# Pre-action snapshot that also starts counting DOM mutations. The observer
+# only lives for one ACT call: _COLLECT_MUTATIONS_SCRIPT reads and removes it,
+# and a navigation discards it with the old document.
+_OBSERVE_MUTATIONS_SCRIPT = """(() => {
+    window.__bimcp_observer?.disconnect();
+    const observer = new MutationObserver((records) => {
+        observer.count += records.length;
+    });
+    observer.count = 0;
+    observer.observe(document, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        characterData: true,
+    });
+    window.__bimcp_observer = observer;
+    return {url: location.href, title: document.title, mutations: 0};
+})()"""
+
+_COLLECT_MUTATIONS_SCRIPT = """(() => {
+    const observer = window.__bimcp_observer;
+    delete window.__bimcp_observer;
+    let mutations = 0;
+    if (observer) {
+        mutations = observer.count + observer.takeRecords().length;
+        observer.disconnect();
+    }
+    return {url: location.href, title: document.title, mutations};
+})()"""
+
+
+# Serialize the document like page.content() but only return the first `max`
+# characters, along with the full length.
+_DOCUMENT_HTML_SCRIPT = """(max) => {
+    let html = document.doctype
+        ? new XMLSerializer().serializeToString(document.doctype)
+        : "";
+    if (document.documentElement) html += document.documentElement.outerHTML;
+    return {html: html.slice(0, max), length: html.length};
+}"""
+
+_ELEMENT_HTML_SCRIPT = """(el, max) => {
+    const html = el.innerHTML;
+    return {html: html.slice(0, max), length: html.length};
+}"""
+
+
+def _format_timestamp(timestamp_ns: int) -> str:
+    """Format a capture timestamp (ns since epoch) as local ISO-8601."""
+    return datetime.fromtimestamp(timestamp_ns / 1_000_000_000).isoformat()
+
+
+# URLs with an explicit http(s) scheme, in any case, are navigated as given
+_SCHEME_RE = re.compile(r"^https?://", re.IGNORECASE)
+
+
+def _normalize_url(url: str) -> str:
+    """Default scheme-less URLs to https."""
+    return url if _SCHEME_RE.match(url) else f"https://{url}"
+
+
+def _entries_since(
+    entries: deque, last_seq: int, since_seq: Optional[int]
+) -> list[tuple[int, object]]:
+    """Return (seq, entry) pairs captured after since_seq, oldest first.
+
+    Walks only the new tail of the ring buffer, so polling with a cursor
+    costs O(new entries) rather than O(buffer size).
+    """
+    count = len(entries)
+    if since_seq is not None:
+        count = min(count, max(last_seq - since_seq, 0))
+    newest = list(islice(reversed(entries), count))
+    newest.reverse()
+    return list(enumerate(newest, start=last_seq - count + 1))
+
 
 @dataclass
 class ConsoleEntry:
@@ -35,7 +146,7 @@ class ConsoleEntry:
 
     level: str
     message: str
-    timestamp: datetime
+    timestamp_ns: int
 
 
 @dataclass
@@ -45,7 +156,7 @@ class NetworkEntry:
     method: str
     url: str
     status: Optional[int]
-    timestamp: datetime
+    timestamp_ns: int
 
 
 @dataclass
@@ -62,13 +173,26 @@ class CDPSession:
     escalation_reason: Optional[str] = None
     owns_context: bool = False
     owns_page: bool = False
+    # Raw CDP channel to the page for cheap Runtime.evaluate calls
+    cdp: Optional[PlaywrightCDPSession] = None
+    # (event, handler) pairs registered on the page, removed on destroy
+    listeners: list[tuple[str, Callable]] = field(default_factory=list)
 
     # Instrumentation data
     event_log: EventLog = field(default_factory=lambda: EventLog(session=""))
-    console_logs: list[ConsoleEntry] = field(default_factory=list)
-    network_logs: list[NetworkEntry] = field(default_factory=list)
-
-    # Counters for action observation
+    console_logs: deque[ConsoleEntry] = field(
+        default_factory=lambda: deque(maxlen=DEFAULT_MAX_LOG_ENTRIES)
+    )
+    network_logs: deque[NetworkEntry] = field(
+        default_factory=lambda: deque(maxlen=DEFAULT_MAX_LOG_ENTRIES)
+    )
+    # In-flight requests awaiting a response, keyed by Playwright request object
+    pending_requests: dict[Request, NetworkEntry] = field(default_factory=dict)
+
+    # Counters for action observation. The *_seq counters track every entry
+    # ever captured, so deltas stay correct once the ring buffers wrap.
+    console_seq: int = 0
+    network_seq: int = 0
     dom_mutation_count: int = 0
     pending_network_count: int = 0
 
@@ -76,15 +200,136 @@ class CDPSession:
         self.event_log = EventLog(session=self.name)
 
 
+# =============================================================================
+# Page Event Handlers
+# =============================================================================
+#
+# Module-level so each session registers partials instead of fresh closures.
+
+
+def _on_console(session: CDPSession, msg: ConsoleMessage) -> None:
+    session.console_seq += 1
+    session.console_logs.append(
+        ConsoleEntry(
+            level=msg.type,
+            message=msg.text,
+            timestamp_ns=time.time_ns(),
+        )
+    )
+
+
+def _on_request(session: CDPSession, request: Request) -> None:
+    session.pending_network_count += 1
+    entry = NetworkEntry(
+        method=request.method,
+        url=request.url,
+        status=None,
+        timestamp_ns=time.time_ns(),
+    )
+    session.network_seq += 1
+    session.network_logs.append(entry)
+    session.pending_requests[request] = entry
+
+
+def _on_response(session: CDPSession, response: Response) -> None:
+    entry = session.pending_requests.pop(response.request, None)
+    if entry is not None:
+        entry.status = response.status
+
+
+def _on_request_failed(session: CDPSession, request: Request) -> None:
+    session.pending_requests.pop(request, None)
+
+
+class _SettleWatcher:
+    """Follows a page's reaction to an action.
+
+    Registered before the action runs, so requests and navigations it
+    starts straight away are not missed.
+    """
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self.navigated = False
+        self.in_flight: set[Request] = set()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self._listeners = (
+            ("request", self._on_request),
+            ("requestfinished", self._on_request_done),
+            ("requestfailed", self._on_request_done),
+            ("framenavigated", self._on_frame_navigated),
+        )
+        for event, handler in self._listeners:
+            page.on(event, handler)
+
+    def _on_request(self, request: Request) -> None:
+        self.in_flight.add(request)
+        self.idle.clear()
+
+    def _on_request_done(self, request: Request) -> None:
+        self.in_flight.discard(request)
+        if not self.in_flight:
+            self.idle.set()
+
+    def _on_frame_navigated(self, frame) -> None:
+        if frame.parent_frame is None:
+            self.navigated = True
+
+    async def wait(self) -> None:
+        """Wait for the page to settle, then stop listening.
+
+        Allows _SETTLE_GRACE for late events, then waits up to
+        _SETTLE_TIMEOUT for every request started since registration to
+        finish. When the main frame navigated, also waits for the new
+        document to parse so it can be observed.
+        """
+        try:
+            await asyncio.sleep(_SETTLE_GRACE)
+            try:
+                await asyncio.wait_for(self.idle.wait(), timeout=_SETTLE_TIMEOUT)
+            except TimeoutError:
+                pass
+        finally:
+            for event, handler in self._listeners:
+                self.page.remove_listener(event, handler)
+
+        if self.navigated:
+            try:
+                await self.page.wait_for_load_state(
+                    "domcontentloaded", timeout=_ACTION_TIMEOUT_MS
+                )
+            except PlaywrightTimeoutError:
+                pass  # Observe whatever state the page reached
+
+
 class CDPBackend(BrowserBackend):
     """Playwright CDP-based browser instrumentation backend.
 
     Connects to an already-running browser over CDP.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_log_entries: int = DEFAULT_MAX_LOG_ENTRIES,
+        event_flush_interval: float = DEFAULT_EVENT_FLUSH_INTERVAL,
+    ):
+        """Initialize CDP backend.
+
+        Args:
+            max_log_entries: Console/network entries retained per session.
+                Older entries are dropped once the cap is reached.
+            event_flush_interval: Seconds between background commits of
+                buffered events to session logs. Reads always flush first.
+        """
         self._playwright: Optional[Playwright] = None
         self._sessions: dict[str, CDPSession] = {}
+        # One connection per endpoint, shared by sessions: cdp_url -> (browser, refcount)
+        self._browsers_by_cdp: dict[str, tuple[Browser, int]] = {}
+        self._max_log_entries = max_log_entries
+        self._event_flush_interval = event_flush_interval
+        self._pending_events: deque[Event] = deque()
+        self._flush_task: Optional[asyncio.Task] = None
 
     # =========================================================================
     # Lifecycle
@@ -93,11 +338,22 @@ class CDPBackend(BrowserBackend):
     async def initialize(self) -> None:
         """Start Playwright (no browser launch)."""
         self._playwright = await async_playwright().start()
+        self._flush_task = asyncio.create_task(self._flush_events_periodically())
 
     async def shutdown(self) -> None:
         """Disconnect all sessions and stop Playwright."""
-        for name in list(self._sessions.keys()):
-            await self.destroy_session(name)
+        # Commit what is buffered, then stop the periodic flush for good
+        self._flush_events()
+        if self._flush_task:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+
+        await asyncio.gather(
+            *(self.destroy_session(name) for name in list(self._sessions)),
+            return_exceptions=True,
+        )
 
         if self._playwright:
             await self._playwright.stop()
@@ -125,10 +381,14 @@ class CDPBackend(BrowserBackend):
         if name in self._sessions:
             raise ValueError(f"Session '{name}' already exists")
 
-        browser = await self._playwright.chromium.connect_over_cdp(cdp_url)
-        context, page, owns_context, owns_page = await self._select_context_and_page(
-            browser
-        )
+        browser, shared = await self._acquire_browser(cdp_url)
+        try:
+            context, page, owns_context, owns_page = await self._select_context_and_page(
+                browser, isolated=shared
+            )
+        except Exception:
+            await self._release_browser(cdp_url, browser)
+            raise
 
         session = CDPSession(
             name=name,
@@ -138,10 +398,13 @@ class CDPBackend(BrowserBackend):
             page=page,
             owns_context=owns_context,
             owns_page=owns_page,
+            console_logs=deque(maxlen=self._max_log_entries),
+            network_logs=deque(maxlen=self._max_log_entries),
         )
 
         self._setup_console_handler(session)
         self._setup_network_handler(session)
+        await self._attach_cdp(session)
 
         self._sessions[name] = session
 
@@ -155,15 +418,50 @@ class CDPBackend(BrowserBackend):
 
         return name
 
+    async def _acquire_browser(self, cdp_url: str) -> tuple[Browser, bool]:
+        """Reuse the connection to cdp_url if one is open, else connect.
+
+        Returns the browser and whether another session already uses it.
+        """
+        entry = self._browsers_by_cdp.get(cdp_url)
+        if entry is not None:
+            browser, refcount = entry
+            if browser.is_connected():
+                self._browsers_by_cdp[cdp_url] = (browser, refcount + 1)
+                return browser, True
+
+        browser = await self._playwright.chromium.connect_over_cdp(cdp_url)
+        self._browsers_by_cdp[cdp_url] = (browser, 1)
+        return browser, False
+
+    async def _release_browser(self, cdp_url: str, browser: Browser) -> None:
+        """Drop a session's reference, disconnecting when it was the last one."""
+        entry = self._browsers_by_cdp.get(cdp_url)
+        if entry is not None and entry[0] is browser:
+            refcount = entry[1] - 1
+            if refcount > 0:
+                self._browsers_by_cdp[cdp_url] = (browser, refcount)
+                return
+            del self._browsers_by_cdp[cdp_url]
+
+        await self._disconnect_browser(browser)
+
     async def _select_context_and_page(
-        self, browser: Browser
+        self, browser: Browser, isolated: bool = False
     ) -> tuple[BrowserContext, Page, bool, bool]:
-        """Pick a context/page, creating them if necessary."""
+        """Pick a context/page, creating them if necessary.
+
+        An isolated session gets a fresh context and page of its own, so
+        sessions sharing a connection never drive or observe each other's.
+        """
         owns_context = False
         owns_page = False
 
         contexts = browser.contexts
-        if contexts:
+        if isolated:
+            context = await browser.new_context()
+            owns_context = True
+        elif contexts:
             context = contexts[0]
         else:
             context = await browser.new_context()
@@ -180,8 +478,7 @@ class CDPBackend(BrowserBackend):
 
     async def destroy_session(self, name: str) -> bool:
         """Disconnect from CDP session."""
-        session = self._sessions.pop(name, None)
-        if session is None:
+        if name not in self._sessions:
             return False
 
         self.log_event(
@@ -190,32 +487,40 @@ class CDPBackend(BrowserBackend):
                 session=name,
             )
         )
-
+        # Commit buffered events, the one above included, while the session
+        # is still registered
+        self._flush_events()
+        session = self._sessions.pop(name)
+
+        # The shared connection outlives the session, so stop capturing
+        for event, handler in session.listeners:
+            session.page.remove_listener(event, handler)
+        session.listeners.clear()
+
+        # Best-effort cleanup; the browser must stay connected until it finishes
+        closers = []
+        if session.cdp is not None:
+            closers.append(session.cdp.detach())
         if session.owns_page:
-            try:
-                await session.page.close()
-            except Exception:
-                pass
-
+            closers.append(session.page.close())
         if session.owns_context:
-            try:
-                await session.context.close()
-            except Exception:
-                pass
+            closers.append(session.context.close())
+        await asyncio.gather(*closers, return_exceptions=True)
 
-        await self._disconnect_browser(session.browser)
+        await self._release_browser(session.cdp_url, session.browser)
         return True
 
     async def _disconnect_browser(self, browser: Browser) -> None:
         """Disconnect from the remote browser without closing it."""
-        disconnect = getattr(browser, "disconnect", None)
-        if callable(disconnect):
-            await disconnect()
+        if _BROWSER_DISCONNECT is not None:
+            await _BROWSER_DISCONNECT(browser)
             return
+        # For connect_over_cdp browsers, close() drops the connection only
         await browser.close()
 
     async def list_sessions(self) -> list[dict]:
         """Return info about all active sessions."""
+        self._flush_events()
         result = []
         for session in self._sessions.values():
             try:
@@ -226,7 +531,7 @@ class CDPBackend(BrowserBackend):
             result.append(
                 {
                     "name": session.name,
-                    "status": session.status.value,
+                    "status": session.status,
                     "created_at": session.created_at.isoformat(),
                     "current_url": current_url,
                     "event_count": len(session.event_log.events),
@@ -286,50 +591,55 @@ class CDPBackend(BrowserBackend):
     def get_event_log(self, name: str) -> EventLog:
         """Get the event log for a session."""
         session = self._require_session(name)
+        self._flush_events()
         return session.event_log
 
     def log_event(self, event: Event) -> None:
-        """Append an event to a session's log."""
-        session = self._sessions.get(event.session)
-        if session:
-            session.event_log.append(event)
+        """Buffer an event for its session's log."""
+        self._pending_events.append(event)
 
-    def _setup_console_handler(self, session: CDPSession) -> None:
-        """Set up console message capture."""
+    def _flush_events(self) -> None:
+        """Commit buffered events to their session logs in one batch each."""
+        if not self._pending_events:
+            return
 
-        def on_console(msg: ConsoleMessage):
-            session.console_logs.append(
-                ConsoleEntry(
-                    level=msg.type,
-                    message=msg.text,
-                    timestamp=datetime.now(),
-                )
-            )
+        batches: dict[str, list[Event]] = {}
+        while self._pending_events:
+            event = self._pending_events.popleft()
+            batches.setdefault(event.session, []).append(event)
 
-        session.page.on("console", on_console)
+        for name, events in batches.items():
+            session = self._sessions.get(name)
+            if session:
+                session.event_log.extend(events)
 
-    def _setup_network_handler(self, session: CDPSession) -> None:
-        """Set up network request capture."""
+    async def _flush_events_periodically(self) -> None:
+        """Background task that keeps the pending buffer short."""
+        while True:
+            await asyncio.sleep(self._event_flush_interval)
+            self._flush_events()
 
-        def on_request(request: Request):
-            session.pending_network_count += 1
-            session.network_logs.append(
-                NetworkEntry(
-                    method=request.method,
-                    url=request.url,
-                    status=None,
-                    timestamp=datetime.now(),
-                )
-            )
+    def _listen(self, session: CDPSession, event: str, handler: Callable) -> None:
+        """Register a page handler, remembering it for removal on destroy."""
+        session.page.on(event, handler)
+        session.listeners.append((event, handler))
 
-        def on_response(response: Response):
-            for entry in reversed(session.network_logs):
-                if entry.url == response.url and entry.status is None:
-                    entry.status = response.status
-                    break
+    def _setup_console_handler(self, session: CDPSession) -> None:
+        """Set up console message capture."""
+        self._listen(session, "console", partial(_on_console, session))
 
-        session.page.on("request", on_request)
-        session.page.on("response", on_response)
+    def _setup_network_handler(self, session: CDPSession) -> None:
+        """Set up network request capture."""
+        self._listen(session, "request", partial(_on_request, session))
+        self._listen(session, "response", partial(_on_response, session))
+        self._listen(session, "requestfailed", partial(_on_request_failed, session))
+
+    async def _attach_cdp(self, session: CDPSession) -> None:
+        """Open the session's raw CDP channel, leaving it unset on failure."""
+        try:
+            session.cdp = await session.context.new_cdp_session(session.page)
+        except Exception:
+            session.cdp = None  # Snapshots fall back to page.evaluate
 
     # =========================================================================
     # INSPECT Operations
@@ -339,14 +649,14 @@ class CDPBackend(BrowserBackend):
         """Navigate to URL."""
         sess = self._require_session(session)
 
-        if not url.startswith(("http://", "https://")):
-            url = f"https://{url}"
+        url = _normalize_url(url)
 
         await sess.page.goto(url)
 
+        snapshot = await self._snapshot_page(sess)
         result = {
-            "url": sess.page.url,
-            "title": await sess.page.title(),
+            "url": snapshot["url"],
+            "title": snapshot["title"],
         }
 
         self.log_event(
@@ -359,43 +669,66 @@ class CDPBackend(BrowserBackend):
 
         return result
 
-    async def screenshot(self, session: str, full_page: bool = False) -> bytes:
-        """Take screenshot, return PNG bytes."""
+    async def screenshot(
+        self,
+        session: str,
+        full_page: bool = False,
+        image_format: str = "png",
+        quality: Optional[int] = None,
+        clip: Optional[dict] = None,
+    ) -> bytes:
+        """Take screenshot, return image bytes."""
         sess = self._require_session(session)
-
-        screenshot_bytes = await sess.page.screenshot(full_page=full_page)
+        image_format = ImageFormat(image_format)
+
+        # Quality only applies to lossy formats; Playwright rejects it for PNG
+        screenshot_bytes = await sess.page.screenshot(
+            full_page=full_page,
+            type=image_format.value,
+            quality=quality if image_format == ImageFormat.JPEG else None,
+            clip=clip,
+        )
 
         self.log_event(
             Event(
                 event_type=EventType.SCREENSHOT,
                 session=session,
-                details={"full_page": full_page, "size_bytes": len(screenshot_bytes)},
+                details={
+                    "full_page": full_page,
+                    "format": image_format.value,
+                    "clip": clip,
+                    "size_bytes": len(screenshot_bytes),
+                },
             )
         )
 
         return screenshot_bytes
 
-    async def get_dom(self, session: str, selector: Optional[str] = None) -> dict:
+    async def get_dom(
+        self,
+        session: str,
+        selector: Optional[str] = None,
+        length_only: bool = False,
+    ) -> dict:
         """Get DOM HTML content."""
         sess = self._require_session(session)
 
-        max_length = 100000
+        max_length = 0 if length_only else 100000
 
+        # Truncate in the page so only the returned prefix crosses the wire
         if selector:
             element = await sess.page.query_selector(selector)
             if element:
-                html = await element.inner_html()
+                dom = await element.evaluate(_ELEMENT_HTML_SCRIPT, max_length)
             else:
-                html = ""
+                dom = {"html": "", "length": 0}
         else:
-            html = await sess.page.content()
+            dom = await sess.page.evaluate(_DOCUMENT_HTML_SCRIPT, max_length)
 
-        original_length = len(html)
+        html = dom["html"]
+        original_length = dom["length"]
         truncated = original_length > max_length
 
-        if truncated:
-            html = html[:max_length]
-
         result = {
             "html": html,
             "truncated": truncated,
@@ -406,7 +739,12 @@ class CDPBackend(BrowserBackend):
             Event(
                 event_type=EventType.DOM_READ,
                 session=session,
-                details={"selector": selector, "length": len(html), "truncated": truncated},
+                details={
+                    "selector": selector,
+                    "length": len(html),
+                    "truncated": truncated,
+                    "length_only": length_only,
+                },
             )
         )
 
@@ -440,74 +778,114 @@ class CDPBackend(BrowserBackend):
 
         return result
 
-    async def get_console_logs(self, session: str) -> list[dict]:
-        """Get captured console log entries."""
+    async def get_console_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
+        """Get captured console log entries, optionally only those after since_seq."""
         sess = self._require_session(session)
 
+        entries = _entries_since(sess.console_logs, sess.console_seq, since_seq)
+
         self.log_event(
             Event(
                 event_type=EventType.CONSOLE_READ,
                 session=session,
-                details={"count": len(sess.console_logs)},
+                details={"count": len(entries), "since_seq": since_seq},
             )
         )
 
         return [
             {
+                "seq": seq,
                 "level": entry.level,
                 "message": entry.message,
-                "timestamp": entry.timestamp.isoformat(),
+                "timestamp": _format_timestamp(entry.timestamp_ns),
             }
-            for entry in sess.console_logs
+            for seq, entry in entries
         ]
 
-    async def get_network_logs(self, session: str) -> list[dict]:
-        """Get captured network request entries."""
+    async def get_network_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
+        """Get captured network request entries, optionally only those after since_seq."""
         sess = self._require_session(session)
 
+        entries = _entries_since(sess.network_logs, sess.network_seq, since_seq)
+
         self.log_event(
             Event(
                 event_type=EventType.NETWORK_READ,
                 session=session,
-                details={"count": len(sess.network_logs)},
+                details={"count": len(entries), "since_seq": since_seq},
             )
         )
 
         return [
             {
+                "seq": seq,
                 "method": entry.method,
                 "url": entry.url,
                 "status": entry.status,
-                "timestamp": entry.timestamp.isoformat(),
+                "timestamp": _format_timestamp(entry.timestamp_ns),
             }
-            for entry in sess.network_logs
+            for seq, entry in entries
         ]
 
     # =========================================================================
     # ACT Operations
     # =========================================================================
 
+    async def _snapshot_page(
+        self, sess: CDPSession, script: str = _SNAPSHOT_SCRIPT
+    ) -> dict:
+        """Read url, title and DOM mutation count in a single round-trip.
+
+        Goes through the raw CDP channel when available, skipping
+        page.evaluate's argument marshalling.
+        """
+        try:
+            if sess.cdp is None:
+                return await sess.page.evaluate(script)
+            reply = await sess.cdp.send(
+                "Runtime.evaluate",
+                {"expression": script, "returnByValue": True},
+            )
+            if "exceptionDetails" not in reply:
+                return reply["result"]["value"]
+        except Exception:
+            pass
+        # Execution context may be mid-navigation; fall back to separate reads
+        page = sess.page
+        return {"url": page.url, "title": await page.title(), "mutations": 0}
+
     async def _capture_pre_state(self, sess: CDPSession) -> dict:
         """Capture state before an action."""
+        # Starts the action's mutation observer in the same round-trip
+        snapshot = await self._snapshot_page(sess, _OBSERVE_MUTATIONS_SCRIPT)
         return {
-            "url": sess.page.url,
-            "title": await sess.page.title(),
-            "network_count": len(sess.network_logs),
-            "console_count": len(sess.console_logs),
+            "url": snapshot["url"],
+            "title": snapshot["title"],
+            "network_count": sess.network_seq,
+            "console_count": sess.console_seq,
+            # Listening from before the action; consumed by post-state
+            "settle": _SettleWatcher(sess.page),
         }
 
     async def _capture_post_state(self, sess: CDPSession, pre: dict) -> ActionResult:
         """Capture state after an action and compute changes."""
-        await asyncio.sleep(0.1)
+        await pre["settle"].wait()
 
-        post_url = sess.page.url
-        post_title = await sess.page.title()
-        post_network = len(sess.network_logs)
-        post_console = len(sess.console_logs)
+        # Also removes the observer; after a navigation it went with the
+        # old document and the count is 0
+        snapshot = await self._snapshot_page(sess, _COLLECT_MUTATIONS_SCRIPT)
+        post_url = snapshot["url"]
+        post_title = snapshot["title"]
+        post_network = sess.network_seq
+        post_console = sess.console_seq
 
         observed = ObservedChanges(
             url_changed=post_url != pre["url"],
-            dom_mutations=0,
+            dom_mutations=snapshot["mutations"],
             network_requests=post_network - pre["network_count"],
             console_messages=post_console - pre["console_count"],
             new_url=post_url if post_url != pre["url"] else None,
@@ -520,7 +898,11 @@ class CDPBackend(BrowserBackend):
             post_title=post_title,
         )
 
-        if observed.url_changed or observed.network_requests > 0:
+        if (
+            observed.url_changed
+            or observed.network_requests > 0
+            or observed.dom_mutations > 0
+        ):
             confidence = Confidence.MEDIUM
         else:
             confidence = Confidence.LOW
@@ -549,7 +931,7 @@ class CDPBackend(BrowserBackend):
         pre = await self._capture_pre_state(sess)
 
         try:
-            await sess.page.click(selector, timeout=5000)
+            await sess.page.click(selector, timeout=_ACTION_TIMEOUT_MS)
             notes = ""
         except Exception as e:
             notes = f"Click may have failed: {e}"
@@ -566,11 +948,11 @@ class CDPBackend(BrowserBackend):
                 event_type=EventType.CLICK,
                 session=session,
                 reason=reason,
-                details={
-                    "selector": selector,
-                    "observed_changes": result.observed_changes.model_dump(),
-                    "confidence": result.confidence.value,
-                },
+                details=ClickDetails(
+                    selector=selector,
+                    confidence=result.confidence,
+                    observed_changes=result.observed_changes,
+                ),
             )
         )
 
@@ -591,9 +973,9 @@ class CDPBackend(BrowserBackend):
 
         try:
             if clear_first:
-                await sess.page.fill(selector, text, timeout=5000)
+                await sess.page.fill(selector, text, timeout=_ACTION_TIMEOUT_MS)
             else:
-                await sess.page.type(selector, text, timeout=5000)
+                await sess.page.type(selector, text, timeout=_ACTION_TIMEOUT_MS)
             notes = ""
         except Exception as e:
             notes = f"Type may have failed: {e}"
@@ -610,12 +992,12 @@ class CDPBackend(BrowserBackend):
                 event_type=EventType.TYPE,
                 session=session,
                 reason=reason,
-                details={
-                    "selector": selector,
-                    "text_length": len(text),
-                    "clear_first": clear_first,
-                    "confidence": result.confidence.value,
-                },
+                details=TypeDetails(
+                    selector=selector,
+                    text_length=len(text),
+                    clear_first=clear_first,
+                    confidence=result.confidence,
+                ),
             )
         )
 
@@ -649,10 +1031,10 @@ class CDPBackend(BrowserBackend):
                 event_type=EventType.EXECUTE,
                 session=session,
                 reason=reason,
-                details={
-                    "script_length": len(script),
-                    "confidence": result.confidence.value,
-                },
+                details=ExecuteDetails(
+                    script_length=len(script),
+                    confidence=result.confidence,
+                ),
             )
         )
 
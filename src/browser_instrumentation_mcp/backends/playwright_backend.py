@@ -1,54 +1,77 @@
 """Playwright-based browser instrumentation backend."""
 
 import asyncio
+import json
+import re
+import time
+import weakref
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import islice
 from typing import Optional
 
 from playwright.async_api import (
     Browser,
     BrowserContext,
-    ConsoleMessage,
     Page,
     Playwright,
-    Request,
-    Response,
     async_playwright,
 )
 
 from ..models import (
+    EVENT_LOG_MAX,
     ActionResult,
     Confidence,
     Event,
     EventLog,
     EventType,
+    ImageFormat,
     ObservedChanges,
     PrePostState,
     SessionStatus,
 )
 from .base import BrowserBackend
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
 
-@dataclass
-class ConsoleEntry:
-    """Captured console message."""
+# Default ring-buffer capacity for captured console/network entries per session
+DEFAULT_MAX_LOG_ENTRIES = 10_000
 
-    level: str
-    message: str
-    timestamp: datetime
+# Minimum wait after an action: CDP delivers Network.requestWillBeSent
+# asynchronously, so requests it started may arrive just after it returns
+_SETTLE_GRACE = 0.05
 
+# Upper bound on how long an action waits for in-flight requests to finish
+_NETWORK_QUIET_TIMEOUT = 0.5
 
-@dataclass
-class NetworkEntry:
-    """Captured network request."""
+# Default number of idle browser contexts kept for reuse by new sessions.
+# Off: a reused context keeps origin storage from the session before it.
+DEFAULT_CONTEXT_POOL_SIZE = 0
 
-    method: str
-    url: str
-    status: Optional[int]
-    timestamp: datetime
+_SNAPSHOT_SCRIPT = "() => ({url: location.href, title: document.title})"
 
+# Serialize the document like page.content() but only return the first `max`
+# characters, along with the full length.
+_DOCUMENT_HTML_SCRIPT = """(max) => {
+    let html = document.doctype
+        ? new XMLSerializer().serializeToString(document.doctype)
+        : "";
+    if (document.documentElement) html += document.documentElement.outerHTML;
+    return {html: html.slice(0, max), length: html.length};
+}"""
 
-@dataclass
+_ELEMENT_HTML_SCRIPT = """(el, max) => {
+    const html = el.innerHTML;
+    return {html: html.slice(0, max), length: html.length};
+}"""
+
+
+@dataclass(slots=True, weakref_slot=True)
 class PlaywrightSession:
     """Holds Playwright objects and instrumentation data for a session."""
 
@@ -58,18 +81,195 @@ class PlaywrightSession:
     created_at: datetime = field(default_factory=datetime.now)
     status: SessionStatus = SessionStatus.ACTIVE
     escalation_reason: Optional[str] = None
+    browser: Optional[Browser] = None
+    # Mirrors status == ESCALATED for the per-action permission check
+    escalated: bool = False
 
-    # Instrumentation data
+    # Instrumentation data. Log entries are stored as the JSON-ready dicts
+    # get_console_logs/get_network_logs return, built once at capture.
     event_log: EventLog = field(default_factory=lambda: EventLog(session=""))
-    console_logs: list[ConsoleEntry] = field(default_factory=list)
-    network_logs: list[NetworkEntry] = field(default_factory=list)
-
-    # Counters for action observation
+    console_logs: deque[dict] = field(
+        default_factory=lambda: deque(maxlen=DEFAULT_MAX_LOG_ENTRIES)
+    )
+    network_logs: deque[dict] = field(
+        default_factory=lambda: deque(maxlen=DEFAULT_MAX_LOG_ENTRIES)
+    )
+    # In-flight requests awaiting a response, keyed by CDP requestId
+    pending_requests: dict[str, dict] = field(default_factory=dict)
+
+    # Counters for action observation. The *_seq counters track every entry
+    # ever captured, so deltas stay correct once the ring buffers wrap.
+    console_seq: int = 0
+    network_seq: int = 0
     dom_mutation_count: int = 0
+    # Requests still awaiting a response
     pending_network_count: int = 0
+    # While an action runs: network_seq when it started, how many requests
+    # started since are in flight, and an event set while that count is 0.
+    # Requests from before the action (SSE, long-polls) are never waited on.
+    action_start_seq: Optional[int] = None
+    action_pending: int = 0
+    action_quiet: asyncio.Event = field(default_factory=asyncio.Event)
 
     def __post_init__(self):
-        self.event_log = EventLog(session=self.name)
+        self.event_log.session = self.name
+
+
+# URLs with an explicit http(s) scheme, in any case, are navigated as given
+_SCHEME_RE = re.compile(r"^https?://", re.IGNORECASE)
+
+
+def _normalize_url(url: str) -> str:
+    """Default scheme-less URLs to https."""
+    return url if _SCHEME_RE.match(url) else f"https://{url}"
+
+
+@lru_cache(maxsize=1)
+def _iso_second(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds).isoformat()
+
+
+def _timestamp_iso() -> str:
+    """Current local time as ISO-8601 with microseconds.
+
+    Reads the clock once via time_ns() and only formats the date/time part
+    when the second changes, which is cheap for bursts of captures.
+    """
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return f"{_iso_second(seconds)}.{nanos // 1000:06d}"
+
+
+def _encode_details(details: dict) -> bytes:
+    """Encode event details as compact JSON for retention in the event log."""
+    if orjson is not None:
+        return orjson.dumps(details)
+    return json.dumps(details, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _entries_since(
+    entries: deque[dict], last_seq: int, since_seq: Optional[int]
+) -> list[dict]:
+    """Return entries captured after since_seq, oldest first.
+
+    Walks only the new tail of the ring buffer, so polling with a cursor
+    costs O(new entries) rather than O(buffer size).
+    """
+    count = len(entries)
+    if since_seq is not None:
+        count = min(count, max(last_seq - since_seq, 0))
+    newest = list(islice(reversed(entries), count))
+    newest.reverse()
+    return newest
+
+
+def _format_remote_object(obj: dict) -> str:
+    """Render a CDP RemoteObject console argument the way DevTools prints it."""
+    if obj.get("type") == "string":
+        return obj.get("value", "")
+    if "description" in obj:
+        return obj["description"]
+    if obj.get("type") == "undefined":
+        return "undefined"
+    value = obj.get("value")
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+# CDP event handlers. Registered via partial() with a weak reference so the
+# CDP session's emitter does not keep a destroyed session alive.
+
+
+def _on_console_api_called(session_ref: weakref.ref, params: dict) -> None:
+    session = session_ref()
+    if session is None:
+        return
+    session.console_seq += 1
+    session.console_logs.append(
+        {
+            "seq": session.console_seq,
+            "level": params["type"],
+            "message": " ".join(
+                _format_remote_object(arg) for arg in params.get("args", ())
+            ),
+            "timestamp": _timestamp_iso(),
+        }
+    )
+
+
+def _append_network_entry(
+    session: PlaywrightSession,
+    method: Optional[str],
+    url: str,
+    status: Optional[int],
+) -> dict:
+    session.network_seq += 1
+    entry = {
+        "seq": session.network_seq,
+        "method": method,
+        "url": url,
+        "status": status,
+        "timestamp": _timestamp_iso(),
+    }
+    session.network_logs.append(entry)
+    return entry
+
+
+def _settle_request(session: PlaywrightSession, request_id: str) -> Optional[dict]:
+    """Stop tracking an in-flight request, returning its entry if it was tracked."""
+    entry = session.pending_requests.pop(request_id, None)
+    if entry is not None:
+        session.pending_network_count -= 1
+        start = session.action_start_seq
+        if start is not None and entry["seq"] > start:
+            session.action_pending -= 1
+            if session.action_pending == 0:
+                session.action_quiet.set()
+    return entry
+
+
+def _on_request_will_be_sent(session_ref: weakref.ref, params: dict) -> None:
+    session = session_ref()
+    if session is None:
+        return
+    request_id = params["requestId"]
+    # Redirect hops reuse the requestId and carry the previous hop's response
+    redirect = params.get("redirectResponse")
+    if redirect is not None:
+        entry = _settle_request(session, request_id)
+        if entry is not None:
+            entry["status"] = redirect["status"]
+
+    request = params["request"]
+    session.pending_network_count += 1
+    if session.action_start_seq is not None:
+        session.action_pending += 1
+        session.action_quiet.clear()
+    session.pending_requests[request_id] = _append_network_entry(
+        session, request["method"], request["url"], None
+    )
+
+
+def _on_response_received(session_ref: weakref.ref, params: dict) -> None:
+    session = session_ref()
+    if session is None:
+        return
+    response = params["response"]
+    entry = _settle_request(session, params["requestId"])
+    if entry is None:
+        # Request predates capture; record the response on its own
+        _append_network_entry(session, None, response["url"], response["status"])
+        return
+    entry["status"] = response["status"]
+
+
+def _on_loading_failed(session_ref: weakref.ref, params: dict) -> None:
+    session = session_ref()
+    if session is None:
+        return
+    _settle_request(session, params["requestId"])
 
 
 class PlaywrightBackend(BrowserBackend):
@@ -79,28 +279,81 @@ class PlaywrightBackend(BrowserBackend):
     Actions require explicit escalation and justification.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_log_entries: int = DEFAULT_MAX_LOG_ENTRIES,
+        max_events: int = EVENT_LOG_MAX,
+        context_pool_size: int = DEFAULT_CONTEXT_POOL_SIZE,
+        sessions_per_browser: Optional[int] = None,
+        cdp_endpoint: Optional[str] = None,
+    ):
+        """Initialize Playwright backend.
+
+        Args:
+            max_log_entries: Console/network entries retained per session.
+                Older entries are dropped once the cap is reached.
+            max_events: Event log entries retained per session, oldest
+                dropped first.
+            context_pool_size: Idle contexts kept per browser for reuse after
+                a session is destroyed. Reused contexts get cookies and
+                permissions cleared, but localStorage, IndexedDB, caches and
+                service workers carry over to the next session, so only
+                enable this when sessions need no isolation. 0 (the default)
+                disables pooling.
+            sessions_per_browser: Live sessions placed on one browser
+                process before another is launched for the same headless
+                mode. Chromium serializes screenshots per process, so a
+                small cap (e.g. 2) spreads concurrent captures at the cost
+                of memory. None shares a single browser per mode.
+            cdp_endpoint: Connect to this already-running browser with
+                connect_over_cdp instead of launching one, so several
+                server processes can share a single Chromium. Its headless
+                mode is fixed by whoever launched it.
+        """
         self._playwright: Optional[Playwright] = None
-        self._browser: Optional[Browser] = None
+        # Browsers per headless mode; sessions only get a context
+        self._browsers: dict[bool, list[Browser]] = {}
+        # Live sessions per browser, for least-loaded placement
+        self._browser_load: dict[Browser, int] = {}
+        self._browser_lock = asyncio.Lock()
         self._sessions: dict[str, PlaywrightSession] = {}
+        self._max_log_entries = max_log_entries
+        self._max_events = max_events
+        self._context_pool_size = context_pool_size
+        self._sessions_per_browser = sessions_per_browser
+        self._cdp_endpoint = cdp_endpoint
+        # Idle contexts per browser, most recently released on the right
+        self._context_pools: dict[Browser, deque[BrowserContext]] = {}
 
     # =========================================================================
     # Lifecycle
     # =========================================================================
 
     async def initialize(self) -> None:
-        """Start Playwright and launch browser."""
+        """Start Playwright and warm the default (headed) browser."""
         self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=False)
+        await self._launch_browser(headless=False)
 
     async def shutdown(self) -> None:
         """Close all sessions, browser, and Playwright."""
-        for name in list(self._sessions.keys()):
-            await self.destroy_session(name)
+        # Sessions own independent contexts, so tear them down concurrently
+        await asyncio.gather(
+            *(self.destroy_session(name) for name in list(self._sessions)),
+            return_exceptions=True,
+        )
+
+        pooled = [ctx for pool in self._context_pools.values() for ctx in pool]
+        self._context_pools.clear()
+        await asyncio.gather(
+            *(context.close() for context in pooled), return_exceptions=True
+        )
 
-        if self._browser:
-            await self._browser.close()
-            self._browser = None
+        browsers = [browser for pool in self._browsers.values() for browser in pool]
+        self._browsers.clear()
+        self._browser_load.clear()
+        await asyncio.gather(
+            *(browser.close() for browser in browsers), return_exceptions=True
+        )
 
         if self._playwright:
             await self._playwright.stop()
@@ -118,26 +371,36 @@ class PlaywrightBackend(BrowserBackend):
         viewport_height: int = 720,
     ) -> str:
         """Create a new browser session with instrumentation."""
-        if not self._browser:
+        if not self._playwright:
             raise RuntimeError("Backend not initialized. Call initialize() first.")
 
         if name in self._sessions:
             raise ValueError(f"Session '{name}' already exists")
 
-        context = await self._browser.new_context(
-            viewport={"width": viewport_width, "height": viewport_height}
-        )
-        page = await context.new_page()
+        viewport = {"width": viewport_width, "height": viewport_height}
+        browser = await self._acquire_browser(headless)
+        try:
+            context, reused = await self._acquire_context(browser, viewport)
+            page = await context.new_page()
+            if reused:
+                # Fresh contexts already open pages at this viewport
+                await page.set_viewport_size(viewport)
+        except Exception:
+            self._release_browser(browser)
+            raise
 
         session = PlaywrightSession(
             name=name,
             context=context,
             page=page,
+            browser=browser,
+            event_log=EventLog(session=name, events=deque(maxlen=self._max_events)),
+            console_logs=deque(maxlen=self._max_log_entries),
+            network_logs=deque(maxlen=self._max_log_entries),
         )
 
         # Set up instrumentation handlers
-        self._setup_console_handler(session)
-        self._setup_network_handler(session)
+        await self._setup_cdp_listeners(session)
 
         self._sessions[name] = session
 
@@ -147,48 +410,112 @@ class PlaywrightBackend(BrowserBackend):
                 event_type=EventType.SESSION_CREATED,
                 session=name,
                 details={"viewport": f"{viewport_width}x{viewport_height}"},
-            )
+            ),
+            session=session,
         )
 
         return name
 
-    def _setup_console_handler(self, session: PlaywrightSession) -> None:
-        """Set up console message capture."""
-
-        def on_console(msg: ConsoleMessage):
-            session.console_logs.append(
-                ConsoleEntry(
-                    level=msg.type,
-                    message=msg.text,
-                    timestamp=datetime.now(),
-                )
+    async def _launch_browser(self, headless: bool) -> Browser:
+        """Launch (or connect to) a browser for this mode and pool it."""
+        if self._cdp_endpoint:
+            browser = await self._playwright.chromium.connect_over_cdp(
+                self._cdp_endpoint
             )
+        else:
+            browser = await self._playwright.chromium.launch(headless=headless)
+        self._browsers.setdefault(headless, []).append(browser)
+        self._browser_load[browser] = 0
+        return browser
+
+    async def _acquire_browser(self, headless: bool) -> Browser:
+        """Place a session on the least-loaded browser with room for it.
+
+        A new browser is launched when every one for this mode is full.
+        """
+        cap = self._sessions_per_browser
+        if self._cdp_endpoint:
+            # One connection to the shared browser serves every session
+            headless, cap = False, None
+
+        # Serialize placement so concurrent sessions see each other's load
+        async with self._browser_lock:
+            browsers = self._browsers.setdefault(headless, [])
+            for dead in [b for b in browsers if not b.is_connected()]:
+                browsers.remove(dead)
+                self._browser_load.pop(dead, None)
+                self._context_pools.pop(dead, None)
+
+            candidates = [
+                b for b in browsers if cap is None or self._browser_load[b] < cap
+            ]
+            if candidates:
+                browser = min(candidates, key=self._browser_load.__getitem__)
+            else:
+                browser = await self._launch_browser(headless)
+            self._browser_load[browser] += 1
+            return browser
+
+    def _release_browser(self, browser: Browser) -> None:
+        """Give back a session's slot on its browser."""
+        if browser in self._browser_load:
+            self._browser_load[browser] -= 1
+
+    async def _acquire_context(
+        self, browser: Browser, viewport: dict
+    ) -> tuple[BrowserContext, bool]:
+        """Take the most recently released pooled context, or open a new one.
+
+        Returns the context and whether it came from the pool.
+        """
+        pool = self._context_pools.get(browser, ())
+        while pool:
+            context = pool.pop()
+            try:
+                await context.clear_cookies()
+                await context.clear_permissions()
+                return context, True
+            except Exception:
+                # Context died while idle (e.g. browser crash); try the next
+                await asyncio.gather(context.close(), return_exceptions=True)
 
-        session.page.on("console", on_console)
-
-    def _setup_network_handler(self, session: PlaywrightSession) -> None:
-        """Set up network request capture."""
-
-        def on_request(request: Request):
-            session.pending_network_count += 1
-            session.network_logs.append(
-                NetworkEntry(
-                    method=request.method,
-                    url=request.url,
-                    status=None,
-                    timestamp=datetime.now(),
-                )
-            )
+        return await browser.new_context(viewport=viewport), False
 
-        def on_response(response: Response):
-            # Update the matching request with status
-            for entry in reversed(session.network_logs):
-                if entry.url == response.url and entry.status is None:
-                    entry.status = response.status
-                    break
+    async def _release_context(self, browser: Browser, context: BrowserContext) -> None:
+        """Close a session's pages and pool its context, evicting the oldest."""
+        if not self._context_pool_size:
+            await asyncio.gather(context.close(), return_exceptions=True)
+            return
+        try:
+            for page in list(context.pages):
+                await page.close()
+        except Exception:
+            await asyncio.gather(context.close(), return_exceptions=True)
+            return
+
+        pool = self._context_pools.setdefault(browser, deque())
+        pool.append(context)
+        evicted = []
+        while len(pool) > self._context_pool_size:
+            evicted.append(pool.popleft())
+        await asyncio.gather(
+            *(stale.close() for stale in evicted), return_exceptions=True
+        )
 
-        session.page.on("request", on_request)
-        session.page.on("response", on_response)
+    async def _setup_cdp_listeners(self, session: PlaywrightSession) -> None:
+        """Capture console and network traffic from one CDP session on the page.
+
+        A single protocol subscription replaces separate Playwright page
+        events, and requestId gives exact request/response (and redirect)
+        pairing.
+        """
+        cdp = await session.context.new_cdp_session(session.page)
+        session_ref = weakref.ref(session)
+        cdp.on("Runtime.consoleAPICalled", partial(_on_console_api_called, session_ref))
+        cdp.on("Network.requestWillBeSent", partial(_on_request_will_be_sent, session_ref))
+        cdp.on("Network.responseReceived", partial(_on_response_received, session_ref))
+        cdp.on("Network.loadingFailed", partial(_on_loading_failed, session_ref))
+        await asyncio.gather(cdp.send("Network.enable"), cdp.send("Runtime.enable"))
 
     async def destroy_session(self, name: str) -> bool:
         """Close context and remove session."""
@@ -200,10 +527,12 @@ class PlaywrightBackend(BrowserBackend):
             Event(
                 event_type=EventType.SESSION_DESTROYED,
                 session=name,
-            )
+            ),
+            session=session,
         )
 
-        await session.context.close()
+        await self._release_context(session.browser, session.context)
+        self._release_browser(session.browser)
         return True
 
     async def list_sessions(self) -> list[dict]:
@@ -218,7 +547,7 @@ class PlaywrightBackend(BrowserBackend):
             result.append(
                 {
                     "name": session.name,
-                    "status": session.status.value,
+                    "status": session.status,
                     "created_at": session.created_at.isoformat(),
                     "current_url": current_url,
                     "event_count": len(session.event_log.events),
@@ -239,14 +568,13 @@ class PlaywrightBackend(BrowserBackend):
 
     async def is_escalated(self, name: str) -> bool:
         """Check if session has been escalated for actions."""
-        session = self._require_session(name)
-        return session.status == SessionStatus.ESCALATED
+        return self._require_session(name).escalated
 
     async def escalate_session(self, name: str, reason: str) -> dict:
         """Escalate session to allow actions."""
         session = self._require_session(name)
 
-        if session.status == SessionStatus.ESCALATED:
+        if session.escalated:
             return {
                 "escalated": True,
                 "warning": "Session already escalated",
@@ -254,6 +582,7 @@ class PlaywrightBackend(BrowserBackend):
             }
 
         session.status = SessionStatus.ESCALATED
+        session.escalated = True
         session.escalation_reason = reason
 
         self.log_event(
@@ -262,7 +591,8 @@ class PlaywrightBackend(BrowserBackend):
                 session=name,
                 reason=reason,
                 details={"escalation_reason": reason},
-            )
+            ),
+            session=session,
         )
 
         return {
@@ -280,10 +610,20 @@ class PlaywrightBackend(BrowserBackend):
         session = self._require_session(name)
         return session.event_log
 
-    def log_event(self, event: Event) -> None:
-        """Append an event to a session's log."""
-        session = self._sessions.get(event.session)
+    def log_event(
+        self, event: Event, session: Optional[PlaywrightSession] = None
+    ) -> None:
+        """Append an event to a session's log.
+
+        Callers that already hold the session pass it to skip the name lookup.
+        """
+        if session is None:
+            session = self._sessions.get(event.session)
         if session:
+            # Plain dict details are stored as JSON bytes; they are only read
+            # back when the log is serialized
+            if type(event.details) is dict:
+                event.details = _encode_details(event.details)
             session.event_log.append(event)
 
     # =========================================================================
@@ -294,63 +634,84 @@ class PlaywrightBackend(BrowserBackend):
         """Navigate to URL."""
         sess = self._require_session(session)
 
-        if not url.startswith(("http://", "https://")):
-            url = f"https://{url}"
+        url = _normalize_url(url)
 
         await sess.page.goto(url)
 
-        result = {
-            "url": sess.page.url,
-            "title": await sess.page.title(),
-        }
+        result = await self._snapshot_page(sess.page)
 
         self.log_event(
             Event(
                 event_type=EventType.NAVIGATE,
                 session=session,
                 details=result,
-            )
+            ),
+            session=sess,
         )
 
         return result
 
-    async def screenshot(self, session: str, full_page: bool = False) -> bytes:
-        """Take screenshot, return PNG bytes."""
+    async def screenshot(
+        self,
+        session: str,
+        full_page: bool = False,
+        image_format: str = "png",
+        quality: Optional[int] = None,
+        clip: Optional[dict] = None,
+    ) -> bytes:
+        """Take screenshot, return image bytes."""
         sess = self._require_session(session)
-
-        screenshot_bytes = await sess.page.screenshot(full_page=full_page)
+        image_format = ImageFormat(image_format)
+
+        # Quality only applies to lossy formats; Playwright rejects it for PNG
+        screenshot_bytes = await sess.page.screenshot(
+            full_page=full_page,
+            type=image_format.value,
+            quality=quality if image_format == ImageFormat.JPEG else None,
+            clip=clip,
+        )
 
         self.log_event(
             Event(
                 event_type=EventType.SCREENSHOT,
                 session=session,
-                details={"full_page": full_page, "size_bytes": len(screenshot_bytes)},
-            )
+                details={
+                    "full_page": full_page,
+                    "format": image_format.value,
+                    "clip": clip,
+                    "size_bytes": len(screenshot_bytes),
+                },
+            ),
+            session=sess,
         )
 
         return screenshot_bytes
 
-    async def get_dom(self, session: str, selector: Optional[str] = None) -> dict:
+    async def get_dom(
+        self,
+        session: str,
+        selector: Optional[str] = None,
+        length_only: bool = False,
+    ) -> dict:
         """Get DOM HTML content."""
         sess = self._require_session(session)
 
-        max_length = 100000  # 100KB limit
+        max_length = 0 if length_only else 100000  # 100KB limit
 
+        # Truncate in the page so only the returned prefix crosses the wire
         if selector:
             element = await sess.page.query_selector(selector)
             if element:
-                html = await element.inner_html()
+                dom = await element.evaluate(_ELEMENT_HTML_SCRIPT, max_length)
             else:
-                html = ""
+                dom = {"html": "", "length": 0}
         else:
-            html = await sess.page.content()
+            dom = await sess.page.evaluate(_DOCUMENT_HTML_SCRIPT, max_length)
 
-        original_length = len(html)
+        html = dom["html"]
+        original_length = dom["length"]
         truncated = original_length > max_length
 
-        if truncated:
-            html = html[:max_length]
-
         result = {
             "html": html,
             "truncated": truncated,
@@ -361,8 +722,14 @@ class PlaywrightBackend(BrowserBackend):
             Event(
                 event_type=EventType.DOM_READ,
                 session=session,
-                details={"selector": selector, "length": len(html), "truncated": truncated},
-            )
+                details={
+                    "selector": selector,
+                    "length": len(html),
+                    "truncated": truncated,
+                    "length_only": length_only,
+                },
+            ),
+            session=sess,
         )
 
         return result
@@ -390,76 +757,100 @@ class PlaywrightBackend(BrowserBackend):
                 event_type=EventType.TEXT_READ,
                 session=session,
                 details={"selector": selector, "length": len(text)},
-            )
+            ),
+            session=sess,
         )
 
         return result
 
-    async def get_console_logs(self, session: str) -> list[dict]:
-        """Get captured console log entries."""
+    async def get_console_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
+        """Get captured console log entries, optionally only those after since_seq.
+
+        Entries are the session's stored dicts; callers must not mutate them.
+        """
         sess = self._require_session(session)
 
+        entries = _entries_since(sess.console_logs, sess.console_seq, since_seq)
+
         self.log_event(
             Event(
                 event_type=EventType.CONSOLE_READ,
                 session=session,
-                details={"count": len(sess.console_logs)},
-            )
+                details={"count": len(entries), "since_seq": since_seq},
+            ),
+            session=sess,
         )
 
-        return [
-            {
-                "level": entry.level,
-                "message": entry.message,
-                "timestamp": entry.timestamp.isoformat(),
-            }
-            for entry in sess.console_logs
-        ]
+        return entries
 
-    async def get_network_logs(self, session: str) -> list[dict]:
-        """Get captured network request entries."""
+    async def get_network_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
+        """Get captured network request entries, optionally only those after since_seq.
+
+        Entries are the session's stored dicts; callers must not mutate them.
+        """
         sess = self._require_session(session)
 
+        entries = _entries_since(sess.network_logs, sess.network_seq, since_seq)
+
         self.log_event(
             Event(
                 event_type=EventType.NETWORK_READ,
                 session=session,
-                details={"count": len(sess.network_logs)},
-            )
+                details={"count": len(entries), "since_seq": since_seq},
+            ),
+            session=sess,
         )
 
-        return [
-            {
-                "method": entry.method,
-                "url": entry.url,
-                "status": entry.status,
-                "timestamp": entry.timestamp.isoformat(),
-            }
-            for entry in sess.network_logs
-        ]
+        return entries
 
     # =========================================================================
     # ACT Operations
     # =========================================================================
 
+    async def _snapshot_page(self, page: Page) -> dict:
+        """Read url and title in a single round-trip."""
+        try:
+            return await page.evaluate(_SNAPSHOT_SCRIPT)
+        except Exception:
+            # Execution context may be mid-navigation; fall back to separate reads
+            return {"url": page.url, "title": await page.title()}
+
     async def _capture_pre_state(self, sess: PlaywrightSession) -> dict:
         """Capture state before an action."""
+        snapshot = await self._snapshot_page(sess.page)
+        # Only requests started from here on hold up the post-state
+        sess.action_start_seq = sess.network_seq
+        sess.action_pending = 0
+        sess.action_quiet.set()
         return {
-            "url": sess.page.url,
-            "title": await sess.page.title(),
-            "network_count": len(sess.network_logs),
-            "console_count": len(sess.console_logs),
+            "url": snapshot["url"],
+            "title": snapshot["title"],
+            "network_count": sess.network_seq,
+            "console_count": sess.console_seq,
         }
 
     async def _capture_post_state(self, sess: PlaywrightSession, pre: dict) -> ActionResult:
         """Capture state after an action and compute changes."""
-        # Small delay to let async effects settle
-        await asyncio.sleep(0.1)
+        # Give the action's requests time to be reported, then let them finish
+        try:
+            await asyncio.sleep(_SETTLE_GRACE)
+            await asyncio.wait_for(
+                sess.action_quiet.wait(), timeout=_NETWORK_QUIET_TIMEOUT
+            )
+        except TimeoutError:
+            pass  # Long-lived or slow requests; observe what we have
+        finally:
+            sess.action_start_seq = None
 
-        post_url = sess.page.url
-        post_title = await sess.page.title()
-        post_network = len(sess.network_logs)
-        post_console = len(sess.console_logs)
+        snapshot = await self._snapshot_page(sess.page)
+        post_url = snapshot["url"]
+        post_title = snapshot["title"]
+        post_network = sess.network_seq
+        post_console = sess.console_seq
 
         observed = ObservedChanges(
             url_changed=post_url != pre["url"],
@@ -492,7 +883,7 @@ class PlaywrightBackend(BrowserBackend):
     def _require_escalation(self, session: str) -> PlaywrightSession:
         """Get session and verify it's escalated for actions."""
         sess = self._require_session(session)
-        if sess.status != SessionStatus.ESCALATED:
+        if not sess.escalated:
             raise PermissionError(
                 f"Session '{session}' not escalated for actions. "
                 "Call browser_session_escalate first with a reason."
@@ -526,9 +917,10 @@ class PlaywrightBackend(BrowserBackend):
                 details={
                     "selector": selector,
                     "observed_changes": result.observed_changes.model_dump(),
-                    "confidence": result.confidence.value,
+                    "confidence": result.confidence,
                 },
-            )
+            ),
+            session=sess,
         )
 
         return result
@@ -571,9 +963,10 @@ class PlaywrightBackend(BrowserBackend):
                     "selector": selector,
                     "text_length": len(text),
                     "clear_first": clear_first,
-                    "confidence": result.confidence.value,
+                    "confidence": result.confidence,
                 },
-            )
+            ),
+            session=sess,
         )
 
         return result
@@ -608,9 +1001,10 @@ class PlaywrightBackend(BrowserBackend):
                 reason=reason,
                 details={
                     "script_length": len(script),
-                    "confidence": result.confidence.value,
+                    "confidence": result.confidence,
                 },
-            )
+            ),
+            session=sess,
         )
 
         return result
@@ -1,5 +1,6 @@
 """Browser session lifecycle management."""
 
+import asyncio
 from datetime import datetime
 from typing import Optional
 
@@ -36,31 +37,77 @@ class BrowserManager:
         self._initialized = False
         self._cdp_initialized = False
         self._session_backends: dict[str, BrowserBackend] = {}
-
-    async def _persist_session(self, name: str) -> None:
-        """Persist current session metadata."""
+        # Escalation is one-way, so a cached hit never needs revalidating
+        self._escalated: set[str] = set()
+        # Write-behind queue of session names whose metadata needs saving
+        self._dirty_sessions: set[str] = set()
+        # Persisted metadata per session, keyed like save_session's arguments
+        self._session_records: dict[str, dict] = {}
+        self._persist_task: Optional[asyncio.Task] = None
+        self._storage_lock = asyncio.Lock()
+        # Background storage writes, awaited by wait_for_storage/shutdown
+        self._pending_io: set[asyncio.Task] = set()
+
+    def _persist_session(self, name: str, **changes) -> None:
+        """Update a session's metadata record and queue it for storage.
+
+        The manager tracks the persisted fields itself, so saving never
+        needs to ask the backend for them.
+        """
+        record = self._session_records.setdefault(
+            name,
+            {
+                "name": name,
+                "status": SessionStatus.ACTIVE,
+                "created_at": datetime.now(),
+                "escalation_reason": None,
+            },
+        )
+        record.update(changes)
         if self._storage is None:
             return
+        self._dirty_sessions.add(name)
+        if self._persist_task is None or self._persist_task.done():
+            self._persist_task = self._spawn_storage_io(self.flush_storage())
+
+    def _spawn_storage_io(self, coro) -> asyncio.Task:
+        """Run a storage write in the background, tracked until it finishes."""
+        task = asyncio.create_task(coro)
+        self._pending_io.add(task)
+        task.add_done_callback(self._pending_io.discard)
+        return task
+
+    async def _delete_stored_session(self, name: str) -> None:
+        """Delete a session's stored record."""
+        # Wait out any in-flight batch so it cannot re-insert the row
+        async with self._storage_lock:
+            await self._storage.delete_session(name)
 
-        session = None
-        backend = self._session_backends.get(name)
-        if backend:
-            session = await backend.get_session(name)
-        if session is None:
-            created_at = datetime.now()
-            status = SessionStatus.ACTIVE
-            escalation_reason = None
-        else:
-            created_at = getattr(session, "created_at", datetime.now())
-            status = getattr(session, "status", SessionStatus.ACTIVE)
-            escalation_reason = getattr(session, "escalation_reason", None)
-
-        await self._storage.save_session(
-            name=name,
-            status=status,
-            created_at=created_at,
-            escalation_reason=escalation_reason,
-        )
+    async def wait_for_storage(self) -> None:
+        """Wait for background storage writes, then flush anything queued."""
+        while self._pending_io:
+            await asyncio.gather(*self._pending_io, return_exceptions=True)
+        await self.flush_storage()
+
+    async def flush_storage(self) -> None:
+        """Write all queued session metadata to storage in one batch.
+
+        Several updates to one session coalesce into a single row holding
+        its latest state. Updates queued while a batch is being written go
+        out in a follow-up batch, since no new flush is scheduled for them.
+        """
+        async with self._storage_lock:
+            while self._dirty_sessions:
+                names = list(self._dirty_sessions)
+                self._dirty_sessions.clear()
+                # Sessions destroyed before the write went out have no record
+                records = [
+                    dict(self._session_records[name])
+                    for name in names
+                    if name in self._session_records
+                ]
+                if records:
+                    await self._storage.save_session_batch(records)
 
     @property
     def backend(self) -> BrowserBackend:
@@ -74,13 +121,23 @@ class BrowserManager:
             self._initialized = True
 
     async def shutdown(self) -> None:
-        """Shutdown the browser manager and backend."""
+        """Shutdown the browser manager and backends concurrently."""
+        if self._storage is not None:
+            await self.wait_for_storage()
+            await self._storage.close()
+
+        shutdowns = []
         if self._initialized:
-            await self._backend.shutdown()
+            shutdowns.append(self._backend.shutdown())
             self._initialized = False
         if self._cdp_initialized:
-            await self._cdp_backend.shutdown()
+            shutdowns.append(self._cdp_backend.shutdown())
             self._cdp_initialized = False
+        # Let every backend finish tearing down before surfacing a failure
+        results = await asyncio.gather(*shutdowns, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
     # =========================================================================
     # Session Management
@@ -110,7 +167,7 @@ class BrowserManager:
             viewport_height=viewport_height,
         )
         self._session_backends[session_name] = self._backend
-        await self._persist_session(session_name)
+        self._persist_session(session_name)
         return session_name
 
     async def connect_session(self, name: str, cdp_url: str) -> str:
@@ -124,22 +181,22 @@ class BrowserManager:
 
         session_name = await self._cdp_backend.connect_session(name, cdp_url)
         self._session_backends[session_name] = self._cdp_backend
-        await self._persist_session(session_name)
+        self._persist_session(session_name)
         return session_name
 
     async def destroy_session(self, name: str) -> bool:
         """Destroy a session."""
         backend = self._session_backends.get(name)
-        if backend:
-            destroyed = await backend.destroy_session(name)
-        else:
-            destroyed = await self._backend.destroy_session(name)
-            if not destroyed and self._cdp_initialized:
-                destroyed = await self._cdp_backend.destroy_session(name)
-        if destroyed and self._storage is not None:
-            await self._storage.delete_session(name)
+        if backend is None:
+            return False
+        destroyed = await backend.destroy_session(name)
         if destroyed:
             self._session_backends.pop(name, None)
+            self._escalated.discard(name)
+            self._dirty_sessions.discard(name)
+            self._session_records.pop(name, None)
+        if destroyed and self._storage is not None:
+            self._spawn_storage_io(self._delete_stored_session(name))
         return destroyed
 
     async def list_sessions(self) -> list[dict]:
@@ -156,14 +213,22 @@ class BrowserManager:
 
     async def is_escalated(self, name: str) -> bool:
         """Check if session is escalated for actions."""
-        backend = await self._resolve_backend(name)
-        return await backend.is_escalated(name)
+        backend = self._resolve_backend(name)
+        if name in self._escalated:
+            return True
+        escalated = await backend.is_escalated(name)
+        if escalated:
+            self._escalated.add(name)
+        return escalated
 
     async def escalate_session(self, name: str, reason: str) -> dict:
         """Escalate session to allow actions."""
-        backend = await self._resolve_backend(name)
+        backend = self._resolve_backend(name)
         result = await backend.escalate_session(name, reason)
-        await self._persist_session(name)
+        self._escalated.add(name)
+        self._persist_session(
+            name, status=SessionStatus.ESCALATED, escalation_reason=reason
+        )
         return result
 
     # =========================================================================
@@ -172,10 +237,7 @@ class BrowserManager:
 
     def get_event_log(self, name: str) -> EventLog:
         """Get the event log for a session."""
-        backend = self._session_backends.get(name)
-        if backend is None:
-            raise ValueError(f"Session '{name}' not found")
-        return backend.get_event_log(name)
+        return self._resolve_backend(name).get_event_log(name)
 
     # =========================================================================
     # INSPECT Operations (Safe)
@@ -183,33 +245,51 @@ class BrowserManager:
 
     async def navigate(self, session: str, url: str) -> dict:
         """Navigate to URL in session."""
-        backend = await self._resolve_backend(session)
+        backend = self._resolve_backend(session)
         return await backend.navigate(session, url)
 
-    async def screenshot(self, session: str, full_page: bool = False) -> bytes:
+    async def screenshot(
+        self,
+        session: str,
+        full_page: bool = False,
+        image_format: str = "png",
+        quality: Optional[int] = None,
+        clip: Optional[dict] = None,
+    ) -> bytes:
         """Take screenshot in session."""
-        backend = await self._resolve_backend(session)
-        return await backend.screenshot(session, full_page)
+        backend = self._resolve_backend(session)
+        return await backend.screenshot(
+            session, full_page, image_format, quality, clip
+        )
 
-    async def get_dom(self, session: str, selector: Optional[str] = None) -> dict:
+    async def get_dom(
+        self,
+        session: str,
+        selector: Optional[str] = None,
+        length_only: bool = False,
+    ) -> dict:
         """Get DOM HTML content."""
-        backend = await self._resolve_backend(session)
-        return await backend.get_dom(session, selector)
+        backend = self._resolve_backend(session)
+        return await backend.get_dom(session, selector, length_only)
 
     async def get_text(self, session: str, selector: Optional[str] = None) -> dict:
         """Get text content from page."""
-        backend = await self._resolve_backend(session)
+        backend = self._resolve_backend(session)
         return await backend.get_text(session, selector)
 
-    async def get_console_logs(self, session: str) -> list[dict]:
+    async def get_console_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
         """Get captured console log entries."""
-        backend = await self._resolve_backend(session)
-        return await backend.get_console_logs(session)
+        backend = self._resolve_backend(session)
+        return await backend.get_console_logs(session, since_seq)
 
-    async def get_network_logs(self, session: str) -> list[dict]:
+    async def get_network_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
         """Get captured network request entries."""
-        backend = await self._resolve_backend(session)
-        return await backend.get_network_logs(session)
+        backend = self._resolve_backend(session)
+        return await backend.get_network_logs(session, since_seq)
 
     # =========================================================================
     # ACT Operations (Require Escalation + Reason)
@@ -217,7 +297,7 @@ class BrowserManager:
 
     async def click(self, session: str, selector: str, reason: str) -> ActionResult:
         """Click element. Requires escalation."""
-        backend = await self._resolve_backend(session)
+        backend = self._resolve_backend(session)
         return await backend.click(session, selector, reason)
 
     async def type_text(
@@ -229,29 +309,21 @@ class BrowserManager:
         clear_first: bool = False,
     ) -> ActionResult:
         """Type text. Requires escalation."""
-        backend = await self._resolve_backend(session)
+        backend = self._resolve_backend(session)
         return await backend.type_text(session, selector, text, reason, clear_first)
 
     async def execute_script(self, session: str, script: str, reason: str) -> ActionResult:
         """Execute JavaScript. Requires escalation."""
-        backend = await self._resolve_backend(session)
+        backend = self._resolve_backend(session)
         return await backend.execute_script(session, script, reason)
 
-    async def _resolve_backend(self, name: str) -> BrowserBackend:
-        """Find which backend owns the session."""
-        backend = self._session_backends.get(name)
-        if backend:
-            return backend
-
-        session = await self._backend.get_session(name)
-        if session:
-            self._session_backends[name] = self._backend
-            return self._backend
-
-        if self._cdp_initialized:
-            session = await self._cdp_backend.get_session(name)
-            if session:
-                self._session_backends[name] = self._cdp_backend
-                return self._cdp_backend
+    def _resolve_backend(self, name: str) -> BrowserBackend:
+        """Find which backend owns the session.
 
-        raise ValueError(f"Session '{name}' not found")
+        _session_backends is the single source of truth: it is filled by
+        create_session, connect_session and list_sessions.
+        """
+        backend = self._session_backends.get(name)
+        if backend is None:
+            raise ValueError(f"Session '{name}' not found")
+        return backend
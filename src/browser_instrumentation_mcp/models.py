@@ -1,10 +1,15 @@
 """Pydantic models for browser instrumentation data."""
 
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
-from typing import Optional
+from enum import StrEnum
+from itertools import islice
+from typing import Annotated, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, WrapSerializer
 
 
 # =============================================================================
@@ -12,7 +17,7 @@ from pydantic import BaseModel, Field
 # =============================================================================
 
 
-class SessionStatus(str, Enum):
+class SessionStatus(StrEnum):
     """Status of a browser session."""
 
     ACTIVE = "active"
@@ -20,7 +25,7 @@ class SessionStatus(str, Enum):
     CLOSED = "closed"
 
 
-class Confidence(str, Enum):
+class Confidence(StrEnum):
     """Confidence level in action outcome."""
 
     LOW = "low"  # Significant uncertainty about what happened
@@ -28,7 +33,14 @@ class Confidence(str, Enum):
     HIGH = "high"  # High confidence in observed outcome
 
 
-class EventType(str, Enum):
+class ImageFormat(StrEnum):
+    """Encoding of a captured screenshot."""
+
+    PNG = "png"
+    JPEG = "jpeg"  # Lossy, typically several times smaller than PNG
+
+
+class EventType(StrEnum):
     """Type of event in the session log."""
 
     SESSION_CREATED = "session_created"
@@ -51,29 +63,91 @@ class EventType(str, Enum):
 # =============================================================================
 
 
-class Event(BaseModel):
-    """A single event in the session log."""
+def _serialize_details(details, handler):
+    if isinstance(details, bytes):
+        return json.loads(details)
+    return handler(details)
+
+
+@dataclass(slots=True)
+class Event:
+    """A single event in the session log.
+
+    A plain slotted dataclass rather than a BaseModel: events are built on
+    every tool call and only serialized when the log is read.
+    """
 
-    timestamp: datetime = Field(default_factory=datetime.now)
     event_type: EventType
     session: str
-    details: dict = Field(default_factory=dict)
+    # bytes holds pre-encoded JSON, a compact form for retained log entries
+    details: Annotated[
+        Union[dict, bytes, "ClickDetails", "TypeDetails", "ExecuteDetails"],
+        WrapSerializer(_serialize_details),
+    ] = field(default_factory=dict)
     reason: Optional[str] = None  # Required for ACT events
+    # Epoch seconds; the datetime is only built when the event is read
+    ts: float = field(default_factory=time.time)
+
+    @property
+    def timestamp(self) -> datetime:
+        """When the event was logged, as a local datetime."""
+        return datetime.fromtimestamp(self.ts)
+
+    def to_dict(self) -> dict:
+        """Dump to a JSON-ready dict, including any detail objects."""
+        data = _EVENT_ADAPTER.dump_python(self, mode="json")
+        data["timestamp"] = datetime.fromtimestamp(data.pop("ts")).isoformat()
+        return data
+
+
+# Maximum events retained per session log; the oldest are dropped first
+EVENT_LOG_MAX = 10_000
 
 
 class EventLog(BaseModel):
-    """Append-only event log for a session."""
+    """Append-only event log for a session.
+
+    Bounded to the newest EVENT_LOG_MAX events; older ones are dropped.
+    """
 
     session: str
-    events: list[Event] = Field(default_factory=list)
+    events: deque[Event] = Field(default_factory=lambda: deque(maxlen=EVENT_LOG_MAX))
+
+    # JSON-mode dumps of the retained events, filled incrementally by to_list
+    _dumped: deque[dict] = PrivateAttr()
+    _appended: int = PrivateAttr(default=0)
+    _dumped_upto: int = PrivateAttr(default=0)
+
+    def model_post_init(self, context) -> None:
+        """Size the dump cache to match the events deque."""
+        self._dumped = deque(maxlen=self.events.maxlen)
+        self._appended = len(self.events)
 
     def append(self, event: Event) -> None:
         """Append an event to the log."""
         self.events.append(event)
+        self._appended += 1
+
+    def extend(self, events: list[Event]) -> None:
+        """Append a batch of events to the log."""
+        self.events.extend(events)
+        self._appended += len(events)
 
     def to_list(self) -> list[dict]:
-        """Convert to list of dicts for serialization."""
-        return [e.model_dump() for e in self.events]
+        """Convert to list of JSON-ready dicts for serialization.
+
+        Detail objects (e.g. ClickDetails, ObservedChanges) are dumped here,
+        at read time, rather than when the event is logged. Only events
+        appended since the previous call are dumped; earlier dumps are reused.
+        """
+        new = min(self._appended - self._dumped_upto, len(self.events))
+        if new:
+            start = len(self.events) - new
+            self._dumped.extend(
+                e.to_dict() for e in islice(self.events, start, None)
+            )
+        self._dumped_upto = self._appended
+        return list(self._dumped)
 
 
 # =============================================================================
@@ -129,7 +203,8 @@ class TextContent(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
-class ConsoleEntry(BaseModel):
+@dataclass(slots=True)
+class ConsoleEntry:
     """A console log entry."""
 
     level: str  # log, warn, error, info
@@ -137,13 +212,14 @@ class ConsoleEntry(BaseModel):
     timestamp: datetime
 
 
-class NetworkEntry(BaseModel):
+@dataclass(slots=True)
+class NetworkEntry:
     """A network request entry."""
 
     method: str
     url: str
-    status: Optional[int] = None
     timestamp: datetime
+    status: Optional[int] = None
 
 
 # =============================================================================
@@ -186,6 +262,42 @@ class ActionResult(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
+# =============================================================================
+# Event Detail Models (slotted; ACT events are logged at high rates)
+# =============================================================================
+
+
+@dataclass(slots=True)
+class ClickDetails:
+    """Details of a logged click action."""
+
+    selector: str
+    confidence: str
+    observed_changes: ObservedChanges
+
+
+@dataclass(slots=True)
+class TypeDetails:
+    """Details of a logged type action."""
+
+    selector: str
+    text_length: int
+    clear_first: bool
+    confidence: str
+
+
+@dataclass(slots=True)
+class ExecuteDetails:
+    """Details of a logged script execution."""
+
+    script_length: int
+    confidence: str
+
+
+_EVENT_ADAPTER = TypeAdapter(Event)
+EventLog.model_rebuild()
+
+
 # =============================================================================
 # Escalation Models
 # =============================================================================
@@ -1,28 +1,80 @@
 """Browser Instrumentation MCP Server - Observation first, action second."""
 
+import asyncio
 import base64
 import json
-from typing import Optional
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Optional
 
 from mcp.server.fastmcp import FastMCP
 
+from .backends.playwright_backend import PlaywrightBackend
 from .browser_manager import BrowserManager
 
-# Global browser manager instance
-_manager: Optional[BrowserManager] = None
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
+
+# Set to a running browser's CDP endpoint (e.g. from browser-mcp-launch-shared)
+# to have every server process share it instead of launching its own
+CDP_ENDPOINT_ENV = "BROWSER_MCP_CDP_ENDPOINT"
+
+
+def _create_manager() -> BrowserManager:
+    """Build the manager, sharing an external browser when one is configured."""
+    endpoint = os.environ.get(CDP_ENDPOINT_ENV)
+    if endpoint:
+        return BrowserManager(backend=PlaywrightBackend(cdp_endpoint=endpoint))
+    return BrowserManager()
+
+
+# Global browser manager instance. Construction does no I/O (backends start
+# on first use), so it is created eagerly and tools read it directly.
+_manager = _create_manager()
 
 
 def get_manager() -> BrowserManager:
-    """Get or create the browser manager."""
-    global _manager
-    if _manager is None:
-        _manager = BrowserManager()
+    """Get the browser manager."""
     return _manager
 
 
+def _json_default(value: Any) -> Any:
+    """Serialize values stdlib json does not handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_json(data: Any) -> str:
+    """Render tool output as indented JSON, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=_json_default, option=orjson.OPT_INDENT_2
+        ).decode()
+    return json.dumps(data, indent=2, default=_json_default)
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Shut the manager down on the server's own loop when it stops.
+
+    This flushes write-behind session metadata and closes storage before
+    the loop and its pending tasks go away.
+    """
+    try:
+        yield
+    finally:
+        await _manager.shutdown()
+
+
 # Create FastMCP server
 mcp = FastMCP(
     name="Browser Instrumentation",
+    lifespan=_lifespan,
 )
 
 
@@ -51,7 +103,7 @@ async def browser_session_create(
     Returns:
         Confirmation message with session name and status
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
         session_name = await manager.create_session(
@@ -80,7 +132,7 @@ async def browser_session_connect(name: str, cdp_url: str) -> str:
     Returns:
         Confirmation message with session name and status
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
         session_name = await manager.connect_session(name=name, cdp_url=cdp_url)
@@ -98,7 +150,7 @@ async def browser_session_list() -> str:
     Returns:
         List of sessions showing name, status (active/escalated), and current URL
     """
-    manager = get_manager()
+    manager = _manager
     sessions = await manager.list_sessions()
 
     if not sessions:
@@ -124,7 +176,7 @@ async def browser_session_destroy(name: str) -> str:
     Returns:
         Confirmation message
     """
-    manager = get_manager()
+    manager = _manager
     destroyed = await manager.destroy_session(name)
 
     if destroyed:
@@ -146,7 +198,7 @@ async def browser_session_escalate(name: str, reason: str) -> str:
     Returns:
         Warning message and confirmation
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
         result = await manager.escalate_session(name, reason)
@@ -178,7 +230,7 @@ async def browser_inspect_navigate(session: str, url: str) -> str:
     Returns:
         The page title and final URL after navigation
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
         result = await manager.navigate(session, url)
@@ -190,22 +242,38 @@ async def browser_inspect_navigate(session: str, url: str) -> str:
 
 
 @mcp.tool()
-async def browser_inspect_screenshot(session: str, full_page: bool = False) -> str:
+async def browser_inspect_screenshot(
+    session: str,
+    full_page: bool = False,
+    image_format: str = "png",
+    quality: Optional[int] = None,
+    clip: Optional[dict[str, float]] = None,
+) -> str:
     """Take a screenshot of the current page.
 
     Args:
         session: Name of the browser session
         full_page: If True, capture the entire scrollable page
+        image_format: "png" (default) or "jpeg" (much smaller for large pages)
+        quality: JPEG quality 0-100 (ignored for PNG)
+        clip: Only capture this region: {"x", "y", "width", "height"} in CSS pixels
 
     Returns:
-        Base64-encoded PNG screenshot with data URI prefix
+        Base64-encoded screenshot with data URI prefix
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
-        screenshot_bytes = await manager.screenshot(session, full_page)
-        b64_data = base64.b64encode(screenshot_bytes).decode("utf-8")
-        return f"data:image/png;base64,{b64_data}"
+        screenshot_bytes = await manager.screenshot(
+            session, full_page, image_format, quality, clip
+        )
+        # Drop each large buffer as soon as the next one exists; at most two
+        # copies of the image are alive at once
+        encoded = base64.b64encode(screenshot_bytes)
+        del screenshot_bytes
+        data_uri = f"data:image/{image_format};base64,".encode("ascii") + encoded
+        del encoded
+        return data_uri.decode("ascii")
     except ValueError as e:
         return f"Error: {e}"
     except Exception as e:
@@ -213,20 +281,27 @@ async def browser_inspect_screenshot(session: str, full_page: bool = False) -> s
 
 
 @mcp.tool()
-async def browser_inspect_dom(session: str, selector: Optional[str] = None) -> str:
+async def browser_inspect_dom(
+    session: str,
+    selector: Optional[str] = None,
+    length_only: bool = False,
+) -> str:
     """Get DOM HTML content from the page.
 
     Args:
         session: Name of the browser session
         selector: Optional CSS selector to get specific element's HTML
+        length_only: If True, only report the HTML length (cheap change detection)
 
     Returns:
-        HTML content (truncated if over 100KB)
+        HTML content (truncated if over 100KB), or its length if length_only
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
-        result = await manager.get_dom(session, selector)
+        result = await manager.get_dom(session, selector, length_only)
+        if length_only:
+            return f"DOM length: {result['original_length'] or 0} characters"
         output = result["html"]
         if result["truncated"]:
             output += f"\n\n[Truncated from {result['original_length']} bytes]"
@@ -248,7 +323,7 @@ async def browser_inspect_text(session: str, selector: Optional[str] = None) ->
     Returns:
         Text content of the page or element
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
         result = await manager.get_text(session, selector)
@@ -260,22 +335,23 @@ async def browser_inspect_text(session: str, selector: Optional[str] = None) ->
 
 
 @mcp.tool()
-async def browser_inspect_console(session: str) -> str:
+async def browser_inspect_console(session: str, since_seq: Optional[int] = None) -> str:
     """Get captured console log messages from the page.
 
     Args:
         session: Name of the browser session
+        since_seq: Only return entries after this seq (from a previous call)
 
     Returns:
-        JSON array of console entries with level, message, and timestamp
+        JSON array of console entries with seq, level, message, and timestamp
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
-        logs = await manager.get_console_logs(session)
+        logs = await manager.get_console_logs(session, since_seq)
         if not logs:
             return "No console messages captured"
-        return json.dumps(logs, indent=2)
+        return _to_json(logs)
     except ValueError as e:
         return f"Error: {e}"
     except Exception as e:
@@ -283,22 +359,23 @@ async def browser_inspect_console(session: str) -> str:
 
 
 @mcp.tool()
-async def browser_inspect_network(session: str) -> str:
+async def browser_inspect_network(session: str, since_seq: Optional[int] = None) -> str:
     """Get captured network requests from the page.
 
     Args:
         session: Name of the browser session
+        since_seq: Only return entries after this seq (from a previous call)
 
     Returns:
-        JSON array of network entries with method, url, status, and timestamp
+        JSON array of network entries with seq, method, url, status, and timestamp
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
-        logs = await manager.get_network_logs(session)
+        logs = await manager.get_network_logs(session, since_seq)
         if not logs:
             return "No network requests captured"
-        return json.dumps(logs, indent=2)
+        return _to_json(logs)
     except ValueError as e:
         return f"Error: {e}"
     except Exception as e:
@@ -317,7 +394,7 @@ async def browser_inspect_events(session: str) -> str:
     Returns:
         JSON array of all events in chronological order
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
         event_log = manager.get_event_log(session)
@@ -325,12 +402,7 @@ async def browser_inspect_events(session: str) -> str:
         if not events:
             return "No events recorded"
 
-        # Convert datetime objects to strings for JSON
-        for event in events:
-            if "timestamp" in event:
-                event["timestamp"] = str(event["timestamp"])
-
-        return json.dumps(events, indent=2)
+        return _to_json(events)
     except ValueError as e:
         return f"Error: {e}"
     except Exception as e:
@@ -356,7 +428,7 @@ async def browser_act_click(session: str, selector: str, reason: str) -> str:
     Returns:
         Observed changes after the click (NOT success/failure)
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
         result = await manager.click(session, selector, reason)
@@ -391,7 +463,7 @@ async def browser_act_type(
     Returns:
         Observed changes after typing (NOT success/failure)
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
         result = await manager.type_text(session, selector, text, reason, clear_first)
@@ -418,7 +490,7 @@ async def browser_act_execute(session: str, script: str, reason: str) -> str:
     Returns:
         Observed changes after execution (NOT success/failure)
     """
-    manager = get_manager()
+    manager = _manager
 
     try:
         result = await manager.execute_script(session, script, reason)
@@ -431,46 +503,55 @@ async def browser_act_execute(session: str, script: str, reason: str) -> str:
         return f"Execute failed: {e}"
 
 
+_ACTION_TEMPLATE = (
+    "Action: {action}\n"
+    "Confidence: {confidence}\n"
+    "\n"
+    "Observed Changes:\n"
+    "  URL changed: {url_changed}\n"
+    "  Network requests: {network_requests}\n"
+    "  Console messages: {console_messages}{new_url_line}\n"
+    "\n"
+    "State:\n"
+    "  Before: {pre_url}\n"
+    "  After: {post_url}{notes_line}"
+)
+
+
 def _format_action_result(result) -> str:
     """Format an ActionResult for display."""
     changes = result.observed_changes
     state = result.state
-
-    lines = [
-        f"Action: {result.action}",
-        f"Confidence: {result.confidence.value}",
-        "",
-        "Observed Changes:",
-        f"  URL changed: {changes.url_changed}",
-        f"  Network requests: {changes.network_requests}",
-        f"  Console messages: {changes.console_messages}",
-    ]
-
-    if changes.new_url:
-        lines.append(f"  New URL: {changes.new_url}")
-
-    lines.extend(
-        [
-            "",
-            "State:",
-            f"  Before: {state.pre_url}",
-            f"  After: {state.post_url}",
-        ]
+    return _ACTION_TEMPLATE.format(
+        action=result.action,
+        confidence=result.confidence,
+        url_changed=changes.url_changed,
+        network_requests=changes.network_requests,
+        console_messages=changes.console_messages,
+        new_url_line=f"\n  New URL: {changes.new_url}" if changes.new_url else "",
+        pre_url=state.pre_url,
+        post_url=state.post_url,
+        notes_line=f"\n\nNotes: {result.notes}" if result.notes else "",
     )
 
-    if result.notes:
-        lines.extend(["", f"Notes: {result.notes}"])
-
-    return "\n".join(lines)
-
 
 # =============================================================================
 # Server Entry Point
 # =============================================================================
 
 
+def _install_uvloop() -> None:
+    """Use uvloop's faster event loop for the server when it is installed."""
+    try:
+        import uvloop
+    except ImportError:  # Optional; not available on Windows
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 def main():
     """Run the MCP server."""
+    _install_uvloop()
     mcp.run()
 
 
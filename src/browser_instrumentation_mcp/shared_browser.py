@@ -0,0 +1,43 @@
+"""Launch one Chromium that several MCP server processes can share."""
+
+import argparse
+import asyncio
+
+from playwright.async_api import async_playwright
+
+DEFAULT_PORT = 9222
+
+
+async def _serve(port: int, headless: bool) -> None:
+    """Launch the browser, print its endpoint and wait until it closes."""
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=headless, args=[f"--remote-debugging-port={port}"]
+        )
+        print(f"BROWSER_MCP_CDP_ENDPOINT=http://127.0.0.1:{port}", flush=True)
+
+        closed = asyncio.Event()
+        browser.on("disconnected", lambda _: closed.set())
+        await closed.wait()
+
+
+def main() -> None:
+    """Run the shared browser until it is closed or interrupted."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Launch a Chromium for browser-instrumentation-mcp servers to share. "
+            "Export the printed BROWSER_MCP_CDP_ENDPOINT for each server."
+        )
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--headless", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args.port, args.headless))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+from collections.abc import AsyncIterator
 from datetime import datetime
+from functools import cache
 from pathlib import Path
 from typing import Optional
 
@@ -12,24 +15,136 @@ from platformdirs import user_data_dir
 
 from .models import SessionStatus
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
+
 
 _APP_NAME = "browser-instrumentation-mcp"
 _DB_FILENAME = "sessions.db"
 
 
+# Applied once per connection. WAL lets reads run alongside writes, and with
+# it synchronous=NORMAL only fsyncs at checkpoints instead of every commit.
+_WRITER_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Compiled statements kept per connection; pinned rather than left to the
+# sqlite3 default since every query is reused through it
+_CACHED_STATEMENTS = 128
+
+# One long-lived writer connection, opened on first use
+_conn: Optional[aiosqlite.Connection] = None
+_conn_lock = asyncio.Lock()
+
+# Read-only connections used round-robin by the load/list functions, so
+# reads are not queued behind writes on the writer's thread
+_READ_CONNECTIONS = 4
+_readers: list[aiosqlite.Connection] = []
+_next_reader = 0
+
+# Early-ack session writes: rows wait here, newest per name, while a batch
+# is open. Committed the same way as the event batches below.
+_SESSION_FLUSH_INTERVAL = 0.05
+_session_batch: dict[str, tuple] = {}
+_session_batch_open = False
+_session_flush_task: Optional[asyncio.Task] = None
+
+# Group commit for events: rows wait here while a batch is open. The
+# flush task stays set until the newest batch is committed; each batch
+# waits for the one before it, so awaiting the task covers them all.
+_EVENT_FLUSH_INTERVAL = 0.005
+_event_batch: list[tuple] = []
+_event_batch_open = False
+_event_flush_task: Optional[asyncio.Task] = None
+
+# Event commits between PRAGMA optimize runs, which refresh planner
+# statistics once the events table has grown
+_OPTIMIZE_EVERY = 1000
+_commits_since_optimize = 0
+
+
+@cache
 def _get_db_path() -> Path:
     data_dir = Path(user_data_dir(_APP_NAME))
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir / _DB_FILENAME
 
 
+async def _get_conn() -> aiosqlite.Connection:
+    """Return the shared connection, opening it and the schema on first use."""
+    global _conn
+    if _conn is not None:
+        return _conn
+
+    async with _conn_lock:
+        if _conn is None:
+            conn = await _connect(_get_db_path())
+            for pragma in _WRITER_PRAGMAS:
+                await conn.execute(pragma)
+            await _ensure_schema(conn)
+            _conn = conn
+        return _conn
+
+
+async def _get_reader() -> aiosqlite.Connection:
+    """Return a read-only connection, opening the pool on first use."""
+    global _next_reader
+    if len(_readers) < _READ_CONNECTIONS:
+        # The writer creates the file and schema the readers open
+        await _get_conn()
+        async with _conn_lock:
+            if len(_readers) < _READ_CONNECTIONS:
+                uri = f"{_get_db_path().as_uri()}?mode=ro"
+                reader = await _connect(uri, uri=True)
+                _readers.append(reader)
+                return reader
+    _next_reader = (_next_reader + 1) % len(_readers)
+    return _readers[_next_reader]
+
+
+async def _connect(database, **kwargs) -> aiosqlite.Connection:
+    conn = await aiosqlite.connect(
+        database, cached_statements=_CACHED_STATEMENTS, **kwargs
+    )
+    for pragma in _PRAGMAS:
+        await conn.execute(pragma)
+    return conn
+
+
+async def close() -> None:
+    """Commit pending events and close the shared connections.
+
+    The next call reopens them.
+    """
+    global _conn
+    await flush_sessions()
+    await flush_events()
+    async with _conn_lock:
+        for reader in _readers:
+            await reader.close()
+        _readers.clear()
+        if _conn is not None:
+            await _conn.execute("PRAGMA optimize")
+            await _conn.close()
+            _conn = None
+
+
 async def _ensure_schema(conn: aiosqlite.Connection) -> None:
     await conn.execute(
         """
         CREATE TABLE IF NOT EXISTS sessions (
             name TEXT PRIMARY KEY,
             status TEXT,
-            created_at TEXT,
+            created_at INTEGER,
             escalation_reason TEXT
         )
         """
@@ -40,25 +155,142 @@ async def _ensure_schema(conn: aiosqlite.Connection) -> None:
             id INTEGER PRIMARY KEY,
             session TEXT,
             event_type TEXT,
-            timestamp TEXT,
-            details TEXT,
+            timestamp INTEGER,
+            details BLOB,
             reason TEXT
         )
         """
     )
+    # load_events and list_sessions read in index order instead of sorting
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_events_session_id ON events(session, id)"
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions(created_at)"
+    )
     await conn.commit()
 
 
-def _normalize_status(status: SessionStatus | str) -> str:
-    if isinstance(status, SessionStatus):
-        return status.value
-    return str(status)
+def _encode_details(details: dict) -> bytes:
+    """Encode event details as compact UTF-8 JSON for the BLOB column."""
+    if orjson is not None:
+        return orjson.dumps(details)
+    return json.dumps(details, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _decode_details(raw: bytes | str) -> dict:
+    """Decode stored details; older databases hold them as TEXT."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _load_details(raw: Optional[bytes | str]) -> dict:
+    """Decode a details column, treating empty or corrupt values as {}."""
+    if not raw:
+        return {}
+    try:
+        return _decode_details(raw)
+    except json.JSONDecodeError:
+        return {}
+
+
+def _normalize_timestamp(timestamp: datetime | str) -> int:
+    """Convert to integer microseconds since the epoch for storage."""
+    if timestamp.__class__ is str:
+        timestamp = datetime.fromisoformat(timestamp)
+    return round(timestamp.timestamp() * 1_000_000)
+
+
+def _restore_timestamp(value: int | str) -> datetime:
+    """Convert a stored timestamp back to a local datetime.
+
+    Databases created before timestamps were stored as integers hold ISO
+    text, and their TEXT columns keep new integers as digit strings.
+    """
+    if value.__class__ is str:
+        if not value.isdigit():
+            return datetime.fromisoformat(value)
+        value = int(value)
+    seconds, micros = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=micros)
+
 
+def _session_record(
+    name: str, status: str, created_at: int | str, escalation_reason: Optional[str]
+) -> dict:
+    return {
+        "name": name,
+        "status": status,
+        "created_at": _restore_timestamp(created_at),
+        "escalation_reason": escalation_reason,
+    }
 
-def _normalize_timestamp(timestamp: datetime | str) -> str:
-    if isinstance(timestamp, datetime):
-        return timestamp.isoformat()
-    return str(timestamp)
+
+def _event_record(
+    event_id: int,
+    session: str,
+    event_type: str,
+    timestamp: int | str,
+    details_raw: Optional[bytes | str],
+    reason: Optional[str],
+) -> dict:
+    return {
+        "id": event_id,
+        "session": session,
+        "event_type": event_type,
+        "timestamp": _restore_timestamp(timestamp),
+        "details": _load_details(details_raw),
+        "reason": reason,
+    }
+
+
+# Statements are shared constants so the connection's statement cache
+# (cached_statements) reuses each one's compiled form
+_UPSERT_SESSION_SQL = """
+    INSERT INTO sessions (name, status, created_at, escalation_reason)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        status = excluded.status,
+        created_at = excluded.created_at,
+        escalation_reason = excluded.escalation_reason
+"""
+_SELECT_SESSION_SQL = """
+    SELECT name, status, created_at, escalation_reason
+    FROM sessions
+    WHERE name = ?
+"""
+_DELETE_SESSION_SQL = "DELETE FROM sessions WHERE name = ?"
+_LIST_SESSIONS_SQL = """
+    SELECT name, status, created_at, escalation_reason
+    FROM sessions
+    ORDER BY created_at ASC
+"""
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (session, event_type, timestamp, details, reason)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_LIST_EVENTS_SQL = """
+    SELECT id, session, event_type, timestamp, details, reason
+    FROM events
+    WHERE session = ?
+    ORDER BY id ASC
+"""
+
+
+def _session_row(
+    name: str,
+    status: SessionStatus | str,
+    created_at: datetime | str,
+    escalation_reason: Optional[str],
+) -> tuple:
+    return (
+        name,
+        # SessionStatus is a StrEnum, so str() yields its value
+        str(status),
+        _normalize_timestamp(created_at),
+        escalation_reason,
+    )
 
 
 async def save_session(
@@ -66,80 +298,129 @@ async def save_session(
     status: SessionStatus | str,
     created_at: datetime | str,
     escalation_reason: Optional[str],
+    durable: bool = False,
 ) -> None:
-    """Insert or update a session record."""
-    db_path = _get_db_path()
-    async with aiosqlite.connect(db_path) as conn:
-        conn.row_factory = aiosqlite.Row
-        await _ensure_schema(conn)
-        await conn.execute(
-            """
-            INSERT INTO sessions (name, status, created_at, escalation_reason)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(name) DO UPDATE SET
-                status = excluded.status,
-                created_at = excluded.created_at,
-                escalation_reason = excluded.escalation_reason
-            """,
-            (
-                name,
-                _normalize_status(status),
-                _normalize_timestamp(created_at),
-                escalation_reason,
-            ),
+    """Insert or update a session record.
+
+    By default this returns as soon as the row is queued; it is committed
+    within _SESSION_FLUSH_INTERVAL, so a crash can lose the last few
+    writes. Pass durable=True to wait for the commit, e.g. for audit
+    records such as escalations.
+    """
+    global _session_batch_open, _session_flush_task
+    row = _session_row(name, status, created_at, escalation_reason)
+    if durable:
+        await _drop_queued_sessions([name])
+        conn = await _get_conn()
+        await conn.execute(_UPSERT_SESSION_SQL, row)
+        await conn.commit()
+        return
+    _session_batch[name] = row
+    if not _session_batch_open:
+        _session_batch_open = True
+        _session_flush_task = asyncio.create_task(
+            _commit_session_batch(_session_flush_task)
         )
+
+
+async def _commit_session_batch(previous: Optional[asyncio.Task]) -> None:
+    """Write the queued session rows in one commit."""
+    global _session_batch_open, _session_flush_task
+    try:
+        try:
+            await asyncio.sleep(_SESSION_FLUSH_INTERVAL)
+        finally:
+            # Sessions saved from here on start the next batch
+            _session_batch_open = False
+        rows = list(_session_batch.values())
+        _session_batch.clear()
+
+        # Keep batches committed in the order they were opened
+        if previous is not None:
+            await asyncio.wait([previous])
+        conn = await _get_conn()
+        await conn.executemany(_UPSERT_SESSION_SQL, rows)
         await conn.commit()
+    finally:
+        if _session_flush_task is asyncio.current_task():
+            _session_flush_task = None
+
+
+async def _drop_queued_sessions(names: list[str]) -> None:
+    """Discard queued rows for names and wait out batches already writing.
+
+    Called before a direct write so an older queued row cannot land on top.
+    """
+    for name in names:
+        _session_batch.pop(name, None)
+    await flush_sessions()
+
+
+async def flush_sessions() -> None:
+    """Wait until every session saved so far is committed."""
+    task = _session_flush_task
+    if task is not None:
+        await asyncio.shield(task)
+
+
+async def save_session_batch(records: list[dict]) -> None:
+    """Insert or update several session records in one transaction.
+
+    Each record takes the same keys as save_session's arguments.
+    """
+    if not records:
+        return
+    await _drop_queued_sessions([record["name"] for record in records])
+    conn = await _get_conn()
+    await conn.executemany(
+        _UPSERT_SESSION_SQL,
+        [_session_row(**record) for record in records],
+    )
+    await conn.commit()
 
 
 async def load_session(name: str) -> Optional[dict]:
     """Load a single session record."""
-    db_path = _get_db_path()
-    async with aiosqlite.connect(db_path) as conn:
-        conn.row_factory = aiosqlite.Row
-        await _ensure_schema(conn)
-        async with conn.execute(
-            """
-            SELECT name, status, created_at, escalation_reason
-            FROM sessions
-            WHERE name = ?
-            """,
-            (name,),
-        ) as cursor:
-            row = await cursor.fetchone()
-            if row is None:
-                return None
-            return dict(row)
+    await flush_sessions()
+    conn = await _get_reader()
+    rows = await conn.execute_fetchall(_SELECT_SESSION_SQL, (name,))
+    return _session_record(*rows[0]) if rows else None
 
 
 async def delete_session(name: str) -> bool:
     """Delete a session record."""
-    db_path = _get_db_path()
-    async with aiosqlite.connect(db_path) as conn:
-        conn.row_factory = aiosqlite.Row
-        await _ensure_schema(conn)
-        cursor = await conn.execute(
-            "DELETE FROM sessions WHERE name = ?",
-            (name,),
-        )
-        await conn.commit()
-        return cursor.rowcount > 0
+    await _drop_queued_sessions([name])
+    conn = await _get_conn()
+    cursor = await conn.execute(
+        _DELETE_SESSION_SQL,
+        (name,),
+    )
+    await conn.commit()
+    return cursor.rowcount > 0
 
 
 async def list_sessions() -> list[dict]:
     """List all session records."""
-    db_path = _get_db_path()
-    async with aiosqlite.connect(db_path) as conn:
-        conn.row_factory = aiosqlite.Row
-        await _ensure_schema(conn)
-        async with conn.execute(
-            """
-            SELECT name, status, created_at, escalation_reason
-            FROM sessions
-            ORDER BY created_at ASC
-            """
-        ) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+    await flush_sessions()
+    conn = await _get_reader()
+    rows = await conn.execute_fetchall(_LIST_SESSIONS_SQL)
+    return [_session_record(*row) for row in rows]
+
+
+def _event_row(
+    session: str,
+    event_type: str,
+    timestamp: datetime | str,
+    details: Optional[dict],
+    reason: Optional[str],
+) -> tuple:
+    return (
+        session,
+        event_type,
+        _normalize_timestamp(timestamp),
+        _encode_details(details or {}),
+        reason,
+    )
 
 
 async def save_event(
@@ -149,54 +430,89 @@ async def save_event(
     details: Optional[dict],
     reason: Optional[str],
 ) -> None:
-    """Insert an event record."""
-    db_path = _get_db_path()
-    async with aiosqlite.connect(db_path) as conn:
-        conn.row_factory = aiosqlite.Row
-        await _ensure_schema(conn)
-        details_json = json.dumps(details or {}, ensure_ascii=True)
-        await conn.execute(
-            """
-            INSERT INTO events (session, event_type, timestamp, details, reason)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                session,
-                event_type,
-                _normalize_timestamp(timestamp),
-                details_json,
-                reason,
-            ),
+    """Insert an event record.
+
+    Events saved within _EVENT_FLUSH_INTERVAL of each other are written
+    with one executemany and a single commit. Returns once the event's
+    batch is committed.
+    """
+    row = _event_row(session, event_type, timestamp, details, reason)
+    await _enqueue_events([row])
+
+
+async def save_events(events: list[dict]) -> None:
+    """Insert several event records, committed together.
+
+    Each event takes the same keys as save_event's arguments.
+    """
+    if events:
+        await _enqueue_events([_event_row(**event) for event in events])
+
+
+async def _enqueue_events(rows: list[tuple]) -> None:
+    """Add rows to the open batch and wait for it to commit."""
+    global _event_batch_open, _event_flush_task
+    _event_batch.extend(rows)
+    if not _event_batch_open:
+        _event_batch_open = True
+        _event_flush_task = asyncio.create_task(
+            _commit_event_batch(_event_flush_task)
         )
+    # Shielded so one caller giving up does not cancel the shared batch
+    await asyncio.shield(_event_flush_task)
+
+
+async def _commit_event_batch(previous: Optional[asyncio.Task]) -> None:
+    """Wait for more events to join the batch, then write it in one commit."""
+    global _event_batch_open, _event_flush_task
+    try:
+        try:
+            await asyncio.sleep(_EVENT_FLUSH_INTERVAL)
+        finally:
+            # Events saved from here on start the next batch
+            _event_batch_open = False
+        rows = _event_batch[:]
+        _event_batch.clear()
+
+        # Keep batches committed in the order they were opened
+        if previous is not None:
+            await asyncio.wait([previous])
+        conn = await _get_conn()
+        await conn.executemany(_INSERT_EVENT_SQL, rows)
         await conn.commit()
+        await _maybe_optimize(conn)
+    finally:
+        if _event_flush_task is asyncio.current_task():
+            _event_flush_task = None
+
+
+async def _maybe_optimize(conn: aiosqlite.Connection) -> None:
+    """Run PRAGMA optimize every _OPTIMIZE_EVERY event commits."""
+    global _commits_since_optimize
+    _commits_since_optimize += 1
+    if _commits_since_optimize >= _OPTIMIZE_EVERY:
+        _commits_since_optimize = 0
+        await conn.execute("PRAGMA optimize")
+
+
+async def flush_events() -> None:
+    """Wait until every event saved so far is committed."""
+    task = _event_flush_task
+    if task is not None:
+        await asyncio.shield(task)
 
 
 async def load_events(session: str) -> list[dict]:
     """Load all events for a session."""
-    db_path = _get_db_path()
-    async with aiosqlite.connect(db_path) as conn:
-        conn.row_factory = aiosqlite.Row
-        await _ensure_schema(conn)
-        async with conn.execute(
-            """
-            SELECT id, session, event_type, timestamp, details, reason
-            FROM events
-            WHERE session = ?
-            ORDER BY id ASC
-            """,
-            (session,),
-        ) as cursor:
-            rows = await cursor.fetchall()
-            events: list[dict] = []
-            for row in rows:
-                event = dict(row)
-                details_raw = event.get("details")
-                if details_raw:
-                    try:
-                        event["details"] = json.loads(details_raw)
-                    except json.JSONDecodeError:
-                        event["details"] = {}
-                else:
-                    event["details"] = {}
-                events.append(event)
-            return events
+    return [event async for event in iter_events(session)]
+
+
+async def iter_events(session: str) -> AsyncIterator[dict]:
+    """Yield a session's events in order, fetching rows in chunks."""
+    conn = await _get_reader()
+    async with conn.execute(
+        _LIST_EVENTS_SQL,
+        (session,),
+    ) as cursor:
+        async for row in cursor:
+            yield _event_record(*row)
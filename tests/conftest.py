@@ -6,6 +6,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 import sys
+from types import SimpleNamespace
 from typing import Optional
 
 import pytest
@@ -129,17 +130,33 @@ class FakeBackend(BrowserBackend):
         self.log_event(Event(event_type=EventType.NAVIGATE, session=session, details={}))
         return {"url": url, "title": "Fake"}
 
-    async def screenshot(self, session: str, full_page: bool = False) -> bytes:
+    async def screenshot(
+        self,
+        session: str,
+        full_page: bool = False,
+        image_format: str = "png",
+        quality: Optional[int] = None,
+        clip: Optional[dict] = None,
+    ) -> bytes:
         self.log_event(
             Event(
                 event_type=EventType.SCREENSHOT,
                 session=session,
-                details={"full_page": full_page},
+                details={
+                    "full_page": full_page,
+                    "format": image_format,
+                    "clip": clip,
+                },
             )
         )
         return b"fake-png"
 
-    async def get_dom(self, session: str, selector: Optional[str] = None) -> dict:
+    async def get_dom(
+        self,
+        session: str,
+        selector: Optional[str] = None,
+        length_only: bool = False,
+    ) -> dict:
         self.log_event(
             Event(
                 event_type=EventType.DOM_READ,
@@ -159,7 +176,9 @@ class FakeBackend(BrowserBackend):
         )
         return {"text": "hello", "selector": selector}
 
-    async def get_console_logs(self, session: str) -> list[dict]:
+    async def get_console_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
         self.log_event(
             Event(
                 event_type=EventType.CONSOLE_READ,
@@ -169,7 +188,9 @@ class FakeBackend(BrowserBackend):
         )
         return []
 
-    async def get_network_logs(self, session: str) -> list[dict]:
+    async def get_network_logs(
+        self, session: str, since_seq: Optional[int] = None
+    ) -> list[dict]:
         self.log_event(
             Event(
                 event_type=EventType.NETWORK_READ,
@@ -201,6 +222,139 @@ class FakeCDPBackend(FakeBackend):
         return await self.create_session(name=name)
 
 
+class FakePage:
+    """Minimal stand-in for a Playwright page's event emitter."""
+
+    def __init__(self, url: str = "about:blank") -> None:
+        self.url = url
+        self.handlers: dict[str, list] = {}
+        self.init_scripts: list[str] = []
+        self.closed = False
+
+    def on(self, event: str, handler) -> None:
+        self.handlers.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event: str, handler) -> None:
+        self.handlers.get(event, []).remove(handler)
+
+    def emit(self, event: str, payload) -> None:
+        for handler in list(self.handlers.get(event, [])):
+            handler(payload)
+
+    async def add_init_script(self, script: str) -> None:
+        self.init_scripts.append(script)
+
+    async def evaluate(self, expression: str, *args):
+        return None
+
+    async def set_viewport_size(self, viewport: dict) -> None:
+        self.viewport = viewport
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeCDPSession:
+    """Stand-in for a Playwright CDPSession that records sent commands."""
+
+    def __init__(self) -> None:
+        self.handlers: dict[str, list] = {}
+        self.sent: list[str] = []
+
+    def on(self, event: str, handler) -> None:
+        self.handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event: str, params: dict) -> None:
+        for handler in list(self.handlers.get(event, [])):
+            handler(params)
+
+    async def send(self, method: str, params: Optional[dict] = None) -> dict:
+        self.sent.append(method)
+        return {}
+
+    async def detach(self) -> None:
+        self.detached = True
+
+
+class FakeContext:
+    """Stand-in for a Playwright browser context."""
+
+    def __init__(self) -> None:
+        self.pages: list[FakePage] = []
+        self.cdp_sessions: list[FakeCDPSession] = []
+        self.cookies_cleared = 0
+        self.closed = False
+
+    async def new_cdp_session(self, page: FakePage) -> FakeCDPSession:
+        cdp = FakeCDPSession()
+        self.cdp_sessions.append(cdp)
+        return cdp
+
+    async def new_page(self) -> FakePage:
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def clear_cookies(self) -> None:
+        self.cookies_cleared += 1
+
+    async def clear_permissions(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@dataclass
+class FakeRequest:
+    method: str
+    url: str
+
+    __hash__ = object.__hash__
+
+
+@dataclass
+class FakeResponse:
+    request: FakeRequest
+    status: int
+
+    @property
+    def url(self) -> str:
+        return self.request.url
+
+
+class FakeBrowser:
+    """Stand-in for a browser reached over CDP with one open page."""
+
+    def __init__(self) -> None:
+        self.contexts = [SimpleNamespace(pages=[FakePage()])]
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    async def new_context(self, **kwargs) -> FakeContext:
+        return FakeContext()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeChromium:
+    def __init__(self) -> None:
+        self.connections: list[FakeBrowser] = []
+        self.launches: list[bool] = []
+
+    async def launch(self, headless: bool = True) -> FakeBrowser:
+        self.launches.append(headless)
+        return FakeBrowser()
+
+    async def connect_over_cdp(self, cdp_url: str) -> FakeBrowser:
+        browser = FakeBrowser()
+        self.connections.append(browser)
+        return browser
+
+
 def _build_action_result(action: str, selector: Optional[str]) -> ActionResult:
     observed = ObservedChanges(url_changed=False, dom_mutations=0, network_requests=0)
     state = PrePostState(
@@ -221,7 +375,9 @@ def _build_action_result(action: str, selector: Optional[str]) -> ActionResult:
 class FakeStorage:
     def __init__(self) -> None:
         self.saved: list[dict] = []
+        self.batches: list[int] = []
         self.deleted: list[str] = []
+        self.closed = False
 
     async def save_session(
         self,
@@ -239,10 +395,17 @@ class FakeStorage:
             }
         )
 
+    async def save_session_batch(self, records: list[dict]) -> None:
+        self.batches.append(len(records))
+        self.saved.extend(records)
+
     async def delete_session(self, name: str) -> bool:
         self.deleted.append(name)
         return True
 
+    async def close(self) -> None:
+        self.closed = True
+
 
 @pytest.fixture
 def fake_backend() -> FakeBackend:
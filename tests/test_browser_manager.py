@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 
@@ -5,13 +7,52 @@ import pytest
 async def test_create_and_destroy_session(manager, fake_storage) -> None:
     name = await manager.create_session("alpha")
     assert name == "alpha"
+    await manager.flush_storage()
     assert fake_storage.saved
 
     destroyed = await manager.destroy_session("alpha")
     assert destroyed is True
+    await manager.wait_for_storage()
     assert "alpha" in fake_storage.deleted
 
 
+@pytest.mark.asyncio
+async def test_session_writes_are_coalesced(manager, fake_storage) -> None:
+    await manager.create_session("alpha")
+    await manager.escalate_session("alpha", "need to click")
+    await manager.create_session("beta")
+    await manager.destroy_session("beta")
+    await manager.wait_for_storage()
+
+    assert fake_storage.batches == [1]
+    assert fake_storage.saved[0]["name"] == "alpha"
+    assert fake_storage.saved[0]["status"] == "escalated"
+    assert fake_storage.saved[0]["escalation_reason"] == "need to click"
+    assert fake_storage.deleted == ["beta"]
+
+
+@pytest.mark.asyncio
+async def test_write_during_inflight_batch_is_flushed(manager, fake_storage) -> None:
+    release = asyncio.Event()
+    save_batch = fake_storage.save_session_batch
+
+    async def slow_save_batch(records: list[dict]) -> None:
+        await release.wait()
+        await save_batch(records)
+
+    fake_storage.save_session_batch = slow_save_batch
+    await manager.create_session("alpha")
+    await asyncio.sleep(0)  # Let the flush start writing the first batch
+    await manager.escalate_session("alpha", "need to click")
+
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    assert [record["status"] for record in fake_storage.saved] == ["active", "escalated"]
+    assert fake_storage.saved[-1]["escalation_reason"] == "need to click"
+
+
 @pytest.mark.asyncio
 async def test_connect_session_routes_to_cdp(manager) -> None:
     name = await manager.connect_session("remote", "ws://localhost:9222")
@@ -31,15 +72,28 @@ async def test_escalation_and_actions(manager) -> None:
     assert result.action == "click"
 
 
+@pytest.mark.asyncio
+async def test_escalation_cache_is_dropped_on_destroy(manager) -> None:
+    await manager.create_session("alpha")
+    await manager.escalate_session("alpha", "need to click")
+    await manager.destroy_session("alpha")
+
+    await manager.create_session("alpha")
+    assert await manager.is_escalated("alpha") is False
+
+
 @pytest.mark.asyncio
 async def test_list_sessions_tracks_backends(manager, fake_backend, fake_cdp_backend) -> None:
     await fake_backend.create_session("local")
     await fake_cdp_backend.create_session("remote")
     manager._cdp_initialized = True
+    with pytest.raises(ValueError):
+        await manager.is_escalated("remote")
 
     sessions = await manager.list_sessions()
     names = {session["name"] for session in sessions}
     assert names == {"local", "remote"}
+    assert await manager.is_escalated("remote") is False
 
 
 @pytest.mark.asyncio
@@ -1,8 +1,22 @@
+import asyncio
 import os
+import time
+from collections import deque
+from types import SimpleNamespace
 
 import pytest
 
-from browser_instrumentation_mcp.backends.cdp_backend import CDPBackend
+from browser_instrumentation_mcp.backends.cdp_backend import (
+    _COLLECT_MUTATIONS_SCRIPT,
+    _OBSERVE_MUTATIONS_SCRIPT,
+    _SETTLE_GRACE,
+    _SETTLE_TIMEOUT,
+    CDPBackend,
+    CDPSession,
+)
+from browser_instrumentation_mcp.models import Event, EventType, SessionStatus
+
+from .conftest import FakeChromium, FakePage, FakeRequest, FakeResponse
 
 
 @pytest.mark.asyncio
@@ -27,3 +41,264 @@ async def test_cdp_backend_connect() -> None:
         pytest.skip(f"CDP connection failed: {exc}")
     finally:
         await backend.shutdown()
+
+
+def _make_session(**kwargs) -> CDPSession:
+    return CDPSession(
+        name="alpha",
+        cdp_url="ws://localhost:9222",
+        browser=None,
+        context=None,
+        page=FakePage(),
+        **kwargs,
+    )
+
+
+def test_network_responses_match_their_request() -> None:
+    backend = CDPBackend()
+    session = _make_session()
+    backend._setup_network_handler(session)
+
+    first = FakeRequest(method="GET", url="https://example.com/api")
+    second = FakeRequest(method="GET", url="https://example.com/api")
+    session.page.emit("request", first)
+    session.page.emit("request", second)
+    session.page.emit("response", FakeResponse(request=first, status=500))
+
+    assert [entry.status for entry in session.network_logs] == [500, None]
+
+    session.page.emit("requestfailed", second)
+    assert session.pending_requests == {}
+
+
+def test_console_logs_are_bounded() -> None:
+    backend = CDPBackend()
+    session = _make_session(console_logs=deque(maxlen=2))
+    backend._setup_console_handler(session)
+
+    for text in ("one", "two", "three"):
+        session.page.emit("console", SimpleNamespace(type="log", text=text))
+
+    assert [entry.message for entry in session.console_logs] == ["two", "three"]
+    assert session.console_seq == 3
+
+
+def test_buffered_events_are_flushed_on_read() -> None:
+    backend = CDPBackend()
+    backend._sessions["alpha"] = _make_session()
+
+    backend.log_event(Event(event_type=EventType.NAVIGATE, session="alpha"))
+    backend.log_event(Event(event_type=EventType.DOM_READ, session="alpha"))
+    backend.log_event(Event(event_type=EventType.DOM_READ, session="missing"))
+
+    events = backend.get_event_log("alpha").events
+    assert [event.event_type for event in events] == [
+        EventType.NAVIGATE,
+        EventType.DOM_READ,
+    ]
+    assert not backend._pending_events
+
+
+@pytest.mark.asyncio
+async def test_shutdown_flushes_events_and_awaits_flush_task() -> None:
+    backend = CDPBackend(event_flush_interval=60)
+    session = _make_session()
+    backend._sessions["alpha"] = session
+    flush_task = asyncio.create_task(backend._flush_events_periodically())
+    backend._flush_task = flush_task
+
+    backend.log_event(Event(event_type=EventType.NAVIGATE, session="alpha"))
+    await backend.shutdown()
+
+    assert flush_task.done()
+    assert EventType.NAVIGATE in [event.event_type for event in session.event_log.events]
+
+
+@pytest.mark.asyncio
+async def test_destroy_event_is_recorded() -> None:
+    backend = CDPBackend()
+    backend._playwright = SimpleNamespace(chromium=FakeChromium())
+    await backend.connect_session("alpha", "ws://localhost:9222")
+    session = backend._sessions["alpha"]
+
+    assert await backend.destroy_session("alpha") is True
+    assert [event.event_type for event in session.event_log.events] == [
+        EventType.SESSION_CREATED,
+        EventType.SESSION_DESTROYED,
+    ]
+    assert not backend._pending_events
+
+
+@pytest.mark.asyncio
+async def test_sessions_share_connection_per_endpoint() -> None:
+    chromium = FakeChromium()
+    backend = CDPBackend()
+    backend._playwright = SimpleNamespace(chromium=chromium)
+
+    await backend.connect_session("alpha", "ws://localhost:9222")
+    await backend.connect_session("beta", "ws://localhost:9222")
+    assert len(chromium.connections) == 1
+
+    await backend.destroy_session("alpha")
+    assert chromium.connections[0].closed is False
+
+    await backend.destroy_session("beta")
+    assert chromium.connections[0].closed is True
+
+
+@pytest.mark.asyncio
+async def test_sessions_on_shared_connection_are_isolated() -> None:
+    backend = CDPBackend()
+    backend._playwright = SimpleNamespace(chromium=FakeChromium())
+
+    await backend.connect_session("alpha", "ws://localhost:9222")
+    await backend.connect_session("beta", "ws://localhost:9222")
+    alpha = backend._sessions["alpha"]
+    beta = backend._sessions["beta"]
+    assert beta.context is not alpha.context
+    assert beta.page is not alpha.page
+
+    await backend.destroy_session("alpha")
+    assert not any(alpha.page.handlers.values())
+    assert alpha.page.closed is False
+
+    await backend.destroy_session("beta")
+    assert beta.page.closed is True
+    assert beta.context.closed is True
+
+
+@pytest.mark.asyncio
+async def test_console_logs_since_seq_returns_only_new_entries() -> None:
+    backend = CDPBackend()
+    session = _make_session(console_logs=deque(maxlen=3))
+    backend._sessions["alpha"] = session
+    backend._setup_console_handler(session)
+
+    for text in ("one", "two", "three", "four"):
+        session.page.emit("console", SimpleNamespace(type="log", text=text))
+
+    logs = await backend.get_console_logs("alpha")
+    assert [(entry["seq"], entry["message"]) for entry in logs] == [
+        (2, "two"),
+        (3, "three"),
+        (4, "four"),
+    ]
+
+    logs = await backend.get_console_logs("alpha", since_seq=3)
+    assert [entry["message"] for entry in logs] == ["four"]
+    assert await backend.get_console_logs("alpha", since_seq=4) == []
+
+
+class _FakeCDPChannel:
+    def __init__(self, reply: dict) -> None:
+        self.reply = reply
+        self.sent: list[tuple[str, dict]] = []
+
+    async def send(self, method: str, params: dict) -> dict:
+        self.sent.append((method, params))
+        return self.reply
+
+
+@pytest.mark.asyncio
+async def test_snapshot_uses_raw_runtime_evaluate() -> None:
+    snapshot = {"url": "https://example.com/", "title": "Example", "mutations": 7}
+    channel = _FakeCDPChannel({"result": {"type": "object", "value": snapshot}})
+    session = _make_session(cdp=channel)
+
+    assert await CDPBackend()._snapshot_page(session) == snapshot
+    method, params = channel.sent[0]
+    assert method == "Runtime.evaluate"
+    assert params["returnByValue"] is True
+
+
+class _ActingPage(FakePage):
+    """FakePage whose click runs a callback, for settle-wait tests."""
+
+    def __init__(self, on_click) -> None:
+        super().__init__(url="https://example.com/")
+        self.on_click = on_click
+        self.loads_waited: list[str] = []
+        self.evaluated: list[str] = []
+
+    async def click(self, selector: str, timeout: float) -> None:
+        self.on_click(self)
+
+    async def evaluate(self, expression: str, *args):
+        self.evaluated.append(expression)
+        return {"url": self.url, "title": "", "mutations": 0}
+
+    async def wait_for_load_state(self, state: str, timeout: float) -> None:
+        self.loads_waited.append(state)
+
+
+def _escalated_backend(page: FakePage) -> CDPBackend:
+    backend = CDPBackend()
+    session = CDPSession(
+        name="alpha",
+        cdp_url="ws://localhost:9222",
+        browser=None,
+        context=None,
+        page=page,
+        status=SessionStatus.ESCALATED,
+    )
+    backend._sessions["alpha"] = session
+    return backend
+
+
+@pytest.mark.asyncio
+async def test_action_settles_once_its_requests_finish() -> None:
+    first = FakeRequest(method="GET", url="https://example.com/a")
+    second = FakeRequest(method="GET", url="https://example.com/b")
+    finished = []
+
+    def finish(page: FakePage, request: FakeRequest) -> None:
+        finished.append(request)
+        page.emit("requestfinished", request)
+
+    def start_requests(page: FakePage) -> None:
+        page.emit("request", first)
+        page.emit("request", second)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, finish, page, first)
+        loop.call_later(0.08, finish, page, second)
+
+    page = _ActingPage(start_requests)
+    await _escalated_backend(page).click("alpha", "#go", reason="test")
+
+    assert finished == [first, second]
+    assert not any(page.handlers.values())
+
+
+@pytest.mark.asyncio
+async def test_idle_action_skips_the_settle_timeout() -> None:
+    page = _ActingPage(lambda page: None)
+    started = time.monotonic()
+    await _escalated_backend(page).click("alpha", "#noop", reason="test")
+
+    assert time.monotonic() - started < _SETTLE_GRACE + _SETTLE_TIMEOUT
+    assert page.loads_waited == []
+
+
+@pytest.mark.asyncio
+async def test_navigation_during_action_waits_for_new_document() -> None:
+    def navigate(page: FakePage) -> None:
+        page.url = "https://example.com/next"
+        page.emit("framenavigated", SimpleNamespace(parent_frame=None))
+
+    page = _ActingPage(navigate)
+    result = await _escalated_backend(page).click("alpha", "#link", reason="test")
+
+    assert page.loads_waited == ["domcontentloaded"]
+    assert result.observed_changes.new_url == "https://example.com/next"
+
+
+@pytest.mark.asyncio
+async def test_mutation_observer_only_lives_for_an_action() -> None:
+    backend = CDPBackend()
+    backend._playwright = SimpleNamespace(chromium=FakeChromium())
+    await backend.connect_session("alpha", "ws://localhost:9222")
+    assert backend._sessions["alpha"].page.init_scripts == []
+
+    page = _ActingPage(lambda page: None)
+    await _escalated_backend(page).click("alpha", "#noop", reason="test")
+    assert page.evaluated == [_OBSERVE_MUTATIONS_SCRIPT, _COLLECT_MUTATIONS_SCRIPT]
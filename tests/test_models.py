@@ -1,9 +1,12 @@
+from collections import deque
 from datetime import datetime
 
 import pytest
 
 from browser_instrumentation_mcp.models import (
+    EVENT_LOG_MAX,
     ActionResult,
+    ClickDetails,
     Confidence,
     ConsoleEntry,
     DomSnapshot,
@@ -99,3 +102,53 @@ def test_escalation_models() -> None:
 
     assert request.acknowledged_warning is False
     assert result.requires_ack is True
+
+
+def test_event_log_is_bounded_and_dumps_nested_models() -> None:
+    event_log = EventLog(session="alpha")
+    for index in range(EVENT_LOG_MAX + 1):
+        event_log.append(
+            Event(
+                event_type=EventType.CLICK,
+                session="alpha",
+                details={"index": index, "observed_changes": ObservedChanges()},
+            )
+        )
+
+    assert len(event_log.events) == EVENT_LOG_MAX
+    payload = event_log.to_list()
+    assert payload[0]["details"]["index"] == 1
+    assert payload[0]["details"]["observed_changes"]["url_changed"] is False
+
+
+def test_event_log_dumps_only_new_events() -> None:
+    event_log = EventLog(session="alpha", events=deque(maxlen=2))
+    event_log.append(Event(event_type=EventType.NAVIGATE, session="alpha"))
+    first = event_log.to_list()
+    logged_at = event_log.events[0].timestamp
+    assert first[0]["timestamp"] == logged_at.isoformat()
+    assert "ts" not in first[0]
+
+    event_log.extend(
+        [
+            Event(event_type=EventType.CLICK, session="alpha"),
+            Event(event_type=EventType.TYPE, session="alpha"),
+        ]
+    )
+    payload = event_log.to_list()
+    assert [event["event_type"] for event in payload] == ["click", "type"]
+    assert event_log.to_list() == payload
+
+
+def test_event_keeps_slotted_details_until_dumped() -> None:
+    details = ClickDetails(
+        selector="#button",
+        confidence=Confidence.MEDIUM.value,
+        observed_changes=ObservedChanges(network_requests=2),
+    )
+    event = Event(event_type=EventType.CLICK, session="alpha", details=details)
+
+    assert event.details is details
+    payload = event.to_dict()
+    assert payload["details"]["selector"] == "#button"
+    assert payload["details"]["observed_changes"]["network_requests"] == 2
@@ -1,6 +1,352 @@
+import asyncio
+import gc
+import time
+from collections import deque
+from datetime import datetime
+from types import SimpleNamespace
+
 import pytest
 
-from browser_instrumentation_mcp.backends.playwright_backend import PlaywrightBackend
+from browser_instrumentation_mcp.backends.playwright_backend import (
+    _NETWORK_QUIET_TIMEOUT,
+    PlaywrightBackend,
+    PlaywrightSession,
+    _normalize_url,
+    _timestamp_iso,
+)
+from browser_instrumentation_mcp.models import Confidence
+
+from .conftest import FakeChromium, FakeContext, FakePage
+
+
+def _make_session(**kwargs) -> PlaywrightSession:
+    return PlaywrightSession(
+        name="alpha", context=FakeContext(), page=FakePage(), **kwargs
+    )
+
+
+async def _noop() -> None:
+    return None
+
+
+def _started_backend(**kwargs) -> PlaywrightBackend:
+    backend = PlaywrightBackend(**kwargs)
+    backend._playwright = SimpleNamespace(chromium=FakeChromium(), stop=_noop)
+    return backend
+
+
+async def _attach(backend: PlaywrightBackend, session: PlaywrightSession):
+    await backend._setup_cdp_listeners(session)
+    return session.context.cdp_sessions[-1]
+
+
+def _console_api(*args: dict) -> dict:
+    return {"type": "log", "args": list(args)}
+
+
+def _request(request_id: str, url: str, method: str = "GET", **extra) -> dict:
+    return {"requestId": request_id, "request": {"url": url, "method": method}, **extra}
+
+
+def _response(request_id: str, url: str, status: int) -> dict:
+    return {"requestId": request_id, "response": {"url": url, "status": status}}
+
+
+@pytest.mark.asyncio
+async def test_console_logs_are_bounded_and_keep_seq() -> None:
+    backend = PlaywrightBackend()
+    session = _make_session(console_logs=deque(maxlen=2))
+    backend._sessions["alpha"] = session
+    cdp = await _attach(backend, session)
+    assert set(cdp.sent) == {"Network.enable", "Runtime.enable"}
+
+    for text in ("one", "two", "three"):
+        cdp.emit(
+            "Runtime.consoleAPICalled",
+            _console_api({"type": "string", "value": text}),
+        )
+
+    logs = await backend.get_console_logs("alpha")
+    assert [(entry["seq"], entry["message"]) for entry in logs] == [
+        (2, "two"),
+        (3, "three"),
+    ]
+    logs = await backend.get_console_logs("alpha", since_seq=2)
+    assert [entry["message"] for entry in logs] == ["three"]
+
+
+@pytest.mark.asyncio
+async def test_console_arguments_are_joined_like_devtools() -> None:
+    backend = PlaywrightBackend()
+    session = _make_session()
+    cdp = await _attach(backend, session)
+
+    cdp.emit(
+        "Runtime.consoleAPICalled",
+        _console_api(
+            {"type": "string", "value": "count"},
+            {"type": "number", "value": 3, "description": "3"},
+            {"type": "boolean", "value": True},
+            {"type": "undefined"},
+            {"type": "object", "subtype": "null", "value": None},
+        ),
+    )
+
+    assert session.console_logs[0]["message"] == "count 3 true undefined null"
+
+
+@pytest.mark.asyncio
+async def test_network_responses_match_their_request() -> None:
+    backend = PlaywrightBackend()
+    session = _make_session()
+    cdp = await _attach(backend, session)
+
+    url = "https://example.com/api"
+    cdp.emit("Network.requestWillBeSent", _request("1", url))
+    cdp.emit("Network.requestWillBeSent", _request("2", url))
+    cdp.emit("Network.responseReceived", _response("1", url, 500))
+
+    assert [entry["status"] for entry in session.network_logs] == [500, None]
+
+    assert session.pending_network_count == 1
+
+    cdp.emit("Network.loadingFailed", {"requestId": "2"})
+    assert session.pending_requests == {}
+    assert session.pending_network_count == 0
+
+
+@pytest.mark.asyncio
+async def test_post_state_counts_request_reported_after_action(monkeypatch) -> None:
+    backend = PlaywrightBackend()
+    session = _make_session()
+    cdp = await _attach(backend, session)
+
+    async def snapshot(page):
+        return {"url": "https://example.com/", "title": ""}
+
+    monkeypatch.setattr(backend, "_snapshot_page", snapshot)
+    pre = await backend._capture_pre_state(session)
+    url = "https://example.com/api"
+    loop = asyncio.get_running_loop()
+    # Reported just after the action returned, before anything is in flight
+    loop.call_later(0.01, cdp.emit, "Network.requestWillBeSent", _request("1", url))
+    loop.call_later(0.02, cdp.emit, "Network.responseReceived", _response("1", url, 200))
+
+    result = await backend._capture_post_state(session, pre)
+    assert result.observed_changes.network_requests == 1
+    assert result.confidence == Confidence.MEDIUM
+
+
+@pytest.mark.asyncio
+async def test_post_state_ignores_requests_pending_before_action(monkeypatch) -> None:
+    backend = PlaywrightBackend()
+    session = _make_session()
+    cdp = await _attach(backend, session)
+
+    async def snapshot(page):
+        return {"url": "https://example.com/", "title": ""}
+
+    monkeypatch.setattr(backend, "_snapshot_page", snapshot)
+    # e.g. an SSE stream that never completes
+    cdp.emit("Network.requestWillBeSent", _request("sse", "https://example.com/events"))
+
+    pre = await backend._capture_pre_state(session)
+    started = time.monotonic()
+    await backend._capture_post_state(session, pre)
+
+    assert time.monotonic() - started < _NETWORK_QUIET_TIMEOUT
+    assert session.pending_network_count == 1
+
+
+@pytest.mark.asyncio
+async def test_redirect_hops_are_logged_separately() -> None:
+    backend = PlaywrightBackend()
+    session = _make_session()
+    cdp = await _attach(backend, session)
+
+    cdp.emit("Network.requestWillBeSent", _request("1", "http://example.com/"))
+    cdp.emit(
+        "Network.requestWillBeSent",
+        _request(
+            "1",
+            "https://example.com/",
+            redirectResponse={"url": "http://example.com/", "status": 301},
+        ),
+    )
+    cdp.emit("Network.responseReceived", _response("1", "https://example.com/", 200))
+
+    assert [(entry["url"], entry["status"]) for entry in session.network_logs] == [
+        ("http://example.com/", 301),
+        ("https://example.com/", 200),
+    ]
+    assert session.pending_network_count == 0
+
+
+@pytest.mark.asyncio
+async def test_unmatched_response_is_logged_with_status() -> None:
+    backend = PlaywrightBackend()
+    session = _make_session()
+    cdp = await _attach(backend, session)
+
+    cdp.emit(
+        "Network.responseReceived", _response("9", "https://example.com/early", 204)
+    )
+
+    assert [(entry["seq"], entry["status"]) for entry in session.network_logs] == [
+        (1, 204)
+    ]
+    assert session.pending_network_count == 0
+
+
+@pytest.mark.asyncio
+async def test_destroyed_session_context_is_reused() -> None:
+    backend = _started_backend(context_pool_size=1)
+
+    await backend.create_session("alpha")
+    context = backend._sessions["alpha"].context
+    await backend.destroy_session("alpha")
+    assert context.pages[0].closed is True
+    assert context.closed is False
+
+    await backend.create_session("beta", viewport_width=800, viewport_height=600)
+    assert backend._sessions["beta"].context is context
+    assert context.cookies_cleared == 1
+    assert backend._sessions["beta"].page.viewport == {"width": 800, "height": 600}
+
+    await backend.create_session("gamma")
+    await backend.destroy_session("gamma")
+    await backend.destroy_session("beta")
+    assert context.closed is False
+    (browser,) = backend._browsers[False]
+    assert list(backend._context_pools[browser]) == [context]
+
+
+@pytest.mark.asyncio
+async def test_contexts_are_not_reused_by_default() -> None:
+    backend = _started_backend()
+
+    await backend.create_session("alpha")
+    context = backend._sessions["alpha"].context
+    # Opened at the requested viewport, so the page is not resized
+    assert not hasattr(backend._sessions["alpha"].page, "viewport")
+    await backend.destroy_session("alpha")
+    assert context.closed is True
+
+    await backend.create_session("beta")
+    assert backend._sessions["beta"].context is not context
+
+
+@pytest.mark.asyncio
+async def test_headless_sessions_share_a_separate_browser() -> None:
+    backend = _started_backend(context_pool_size=1)
+
+    chromium = backend._playwright.chromium
+    await backend.create_session("alpha")
+    await backend.create_session("beta", headless=True)
+    await backend.create_session("gamma", headless=True)
+    assert chromium.launches == [False, True]
+    headless_browser = backend._sessions["beta"].browser
+    assert backend._sessions["gamma"].browser is headless_browser
+    assert backend._sessions["alpha"].browser is not headless_browser
+
+    context = backend._sessions["beta"].context
+    await backend.destroy_session("beta")
+    assert list(backend._context_pools[headless_browser]) == [context]
+    assert len(backend._context_pools) == 1
+
+    await backend.shutdown()
+    assert context.closed is True
+    assert backend._browsers == {}
+
+
+@pytest.mark.asyncio
+async def test_sessions_spread_across_browsers_when_capped() -> None:
+    backend = _started_backend(sessions_per_browser=2)
+
+    for name in ("alpha", "beta", "gamma"):
+        await backend.create_session(name, headless=True)
+    first, second = backend._browsers[True]
+    assert [backend._sessions[name].browser for name in ("alpha", "beta", "gamma")] == [
+        first,
+        first,
+        second,
+    ]
+
+    # A freed slot is filled before another browser is launched
+    await backend.destroy_session("alpha")
+    await backend.create_session("delta", headless=True)
+    await backend.create_session("epsilon", headless=True)
+    assert backend._playwright.chromium.launches == [True, True]
+    assert backend._browser_load == {first: 2, second: 2}
+
+
+@pytest.mark.asyncio
+async def test_shared_cdp_endpoint_replaces_launching() -> None:
+    backend = _started_backend(cdp_endpoint="http://127.0.0.1:9222", sessions_per_browser=1)
+    chromium = backend._playwright.chromium
+
+    await backend.create_session("alpha")
+    await backend.create_session("beta", headless=True)
+    assert chromium.launches == []
+    (shared,) = chromium.connections
+    assert backend._sessions["beta"].browser is shared
+
+    await backend.shutdown()
+    assert shared.closed is True
+
+
+@pytest.mark.asyncio
+async def test_cdp_handlers_do_not_keep_session_alive() -> None:
+    backend = PlaywrightBackend()
+    session = _make_session()
+    cdp = await _attach(backend, session)
+
+    del session
+    gc.collect()
+
+    # The orphaned handlers are no-ops rather than errors
+    cdp.emit("Runtime.consoleAPICalled", _console_api())
+    cdp.emit("Network.requestWillBeSent", _request("1", "https://example.com/"))
+    handler = cdp.handlers["Runtime.consoleAPICalled"][0]
+    assert handler.args[0]() is None
+
+
+@pytest.mark.asyncio
+async def test_event_log_cap_is_configurable() -> None:
+    backend = _started_backend(max_events=2)
+    await backend.create_session("alpha")
+
+    await backend.get_console_logs("alpha")
+    await backend.get_network_logs("alpha")
+    event_log = backend.get_event_log("alpha")
+    assert event_log.session == "alpha"
+    assert [event.event_type for event in event_log.events] == [
+        "console_read",
+        "network_read",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_event_details_are_retained_as_json() -> None:
+    backend = _started_backend()
+    await backend.create_session("alpha")
+
+    await backend.get_console_logs("alpha", since_seq=4)
+    event = backend.get_event_log("alpha").events[-1]
+    assert isinstance(event.details, bytes)
+    assert event.to_dict()["details"] == {"count": 0, "since_seq": 4}
+
+
+def test_normalize_url_keeps_explicit_schemes() -> None:
+    assert _normalize_url("example.com") == "https://example.com"
+    assert _normalize_url("http://example.com") == "http://example.com"
+    assert _normalize_url("HTTPS://example.com") == "HTTPS://example.com"
+
+
+def test_timestamp_iso_matches_datetime_format() -> None:
+    before = datetime.now()
+    stamp = datetime.fromisoformat(_timestamp_iso())
+    assert before <= stamp <= datetime.now()
 
 
 @pytest.mark.asyncio
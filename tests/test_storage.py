@@ -1,16 +1,35 @@
+import asyncio
 from datetime import datetime
 
 import pytest
+import pytest_asyncio
 
 from browser_instrumentation_mcp import storage
 from browser_instrumentation_mcp.models import SessionStatus
 
 
-@pytest.mark.asyncio
-async def test_save_and_load_session(tmp_path, monkeypatch) -> None:
-    db_path = tmp_path / "sessions.db"
-    monkeypatch.setattr(storage, "_get_db_path", lambda: db_path)
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_db(tmp_path_factory):
+    path = tmp_path_factory.mktemp("storage") / "sessions.db"
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(storage, "_get_db_path", lambda: path)
+        yield path
+        await storage.close()
 
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def db_path(shared_db):
+    yield shared_db
+    await storage.flush_sessions()
+    await storage.flush_events()
+    conn = await storage._get_conn()
+    await conn.execute("DELETE FROM sessions")
+    await conn.execute("DELETE FROM events")
+    await conn.commit()
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_save_and_load_session(db_path) -> None:
     created_at = datetime.now()
     await storage.save_session(
         name="alpha",
@@ -23,13 +42,11 @@ async def test_save_and_load_session(tmp_path, monkeypatch) -> None:
     assert loaded is not None
     assert loaded["name"] == "alpha"
     assert loaded["status"] == SessionStatus.ACTIVE.value
+    assert loaded["created_at"] == created_at
 
 
-@pytest.mark.asyncio
-async def test_list_and_delete_sessions(tmp_path, monkeypatch) -> None:
-    db_path = tmp_path / "sessions.db"
-    monkeypatch.setattr(storage, "_get_db_path", lambda: db_path)
-
+@pytest.mark.asyncio(loop_scope="module")
+async def test_list_and_delete_sessions(db_path) -> None:
     await storage.save_session(
         name="alpha",
         status="active",
@@ -52,11 +69,117 @@ async def test_list_and_delete_sessions(tmp_path, monkeypatch) -> None:
     assert await storage.load_session("alpha") is None
 
 
-@pytest.mark.asyncio
-async def test_save_and_load_events(tmp_path, monkeypatch) -> None:
-    db_path = tmp_path / "sessions.db"
-    monkeypatch.setattr(storage, "_get_db_path", lambda: db_path)
+@pytest.mark.asyncio(loop_scope="module")
+async def test_save_session_batch_upserts(db_path) -> None:
+    await storage.save_session_batch(
+        [
+            {
+                "name": "alpha",
+                "status": SessionStatus.ACTIVE,
+                "created_at": datetime.now(),
+                "escalation_reason": None,
+            },
+            {
+                "name": "beta",
+                "status": "active",
+                "created_at": datetime.now(),
+                "escalation_reason": None,
+            },
+        ]
+    )
+    await storage.save_session_batch(
+        [
+            {
+                "name": "alpha",
+                "status": SessionStatus.ESCALATED,
+                "created_at": datetime.now(),
+                "escalation_reason": "need to click",
+            }
+        ]
+    )
+
+    sessions = {session["name"]: session for session in await storage.list_sessions()}
+    assert set(sessions) == {"alpha", "beta"}
+    assert sessions["alpha"]["status"] == SessionStatus.ESCALATED.value
+    assert sessions["alpha"]["escalation_reason"] == "need to click"
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_save_session_acks_before_commit_unless_durable(db_path) -> None:
+    now = datetime.now()
+    await storage.save_session("a", SessionStatus.ACTIVE, now, None)
+    assert "a" in storage._session_batch
+
+    await storage.save_session("b", SessionStatus.ESCALATED, now, "x", durable=True)
+    assert "b" not in storage._session_batch
+
+    await storage.flush_sessions()
+    assert not storage._session_batch
+    names = [record["name"] for record in await storage.list_sessions()]
+    assert sorted(names) == ["a", "b"]
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_load_session_waits_for_batch_in_flight(db_path, monkeypatch) -> None:
+    conn = await storage._get_conn()
+    writing = asyncio.Event()
+    original_executemany = conn.executemany
+
+    async def slow_executemany(sql, rows):
+        writing.set()
+        await asyncio.sleep(0.05)
+        return await original_executemany(sql, rows)
+
+    monkeypatch.setattr(conn, "executemany", slow_executemany)
+    await storage.save_session("a", SessionStatus.ACTIVE, datetime.now(), None)
+    await writing.wait()
+
+    assert (await storage.load_session("a"))["name"] == "a"
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_connection_is_shared_until_closed(db_path) -> None:
+    conn = await storage._get_conn()
+    await storage.list_sessions()
+    assert await storage._get_conn() is conn
+
+    await storage.close()
+    assert await storage._get_conn() is not conn
+
 
+@pytest.mark.asyncio(loop_scope="module")
+async def test_reads_use_read_only_connections(db_path) -> None:
+    await storage.save_session("a", SessionStatus.ACTIVE, datetime.now(), None)
+    reader = await storage._get_reader()
+    assert reader is not await storage._get_conn()
+    assert (await storage.load_session("a"))["name"] == "a"
+
+    with pytest.raises(Exception, match="readonly"):
+        await reader.execute("DELETE FROM sessions")
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_connection_uses_wal(db_path) -> None:
+    conn = await storage._get_conn()
+    async with conn.execute("PRAGMA journal_mode") as cursor:
+        (mode,) = await cursor.fetchone()
+    assert mode == "wal"
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_load_events_uses_session_index(db_path) -> None:
+    conn = await storage._get_conn()
+    async with conn.execute(
+        "EXPLAIN QUERY PLAN " + storage._LIST_EVENTS_SQL, ("alpha",)
+    ) as cursor:
+        # EXPLAIN QUERY PLAN rows are (id, parent, notused, detail)
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+    assert "idx_events_session_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_save_and_load_events(db_path) -> None:
     await storage.save_event(
         session="alpha",
         event_type="navigate",
@@ -76,3 +199,176 @@ async def test_save_and_load_events(tmp_path, monkeypatch) -> None:
     assert len(events) == 2
     assert events[0]["event_type"] == "navigate"
     assert events[1]["reason"] == "testing"
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_concurrent_events_share_one_commit(db_path, monkeypatch) -> None:
+    conn = await storage._get_conn()
+    commits = []
+    original_commit = conn.commit
+
+    async def counting_commit():
+        commits.append(1)
+        await original_commit()
+
+    monkeypatch.setattr(conn, "commit", counting_commit)
+    await asyncio.gather(
+        *(
+            storage.save_event(
+                session="alpha",
+                event_type="console_read",
+                timestamp=datetime.now(),
+                details={"index": index},
+                reason=None,
+            )
+            for index in range(5)
+        )
+    )
+
+    assert len(commits) == 1
+    events = await storage.load_events("alpha")
+    assert [event["details"]["index"] for event in events] == list(range(5))
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_close_waits_for_event_batch_in_flight(db_path, monkeypatch) -> None:
+    conn = await storage._get_conn()
+    writing = asyncio.Event()
+    original_executemany = conn.executemany
+
+    async def slow_executemany(sql, rows):
+        writing.set()
+        await asyncio.sleep(0.05)
+        return await original_executemany(sql, rows)
+
+    monkeypatch.setattr(conn, "executemany", slow_executemany)
+    save = asyncio.create_task(
+        storage.save_event("alpha", "navigate", datetime.now(), {}, None)
+    )
+    await writing.wait()
+    await storage.close()
+    await save
+
+    events = await storage.load_events("alpha")
+    assert [event["event_type"] for event in events] == ["navigate"]
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_event_commits_periodically_optimize(db_path, monkeypatch) -> None:
+    conn = await storage._get_conn()
+    statements = []
+    original_execute = conn.execute
+
+    def recording_execute(sql, *args):
+        statements.append(sql)
+        return original_execute(sql, *args)
+
+    monkeypatch.setattr(conn, "execute", recording_execute)
+    monkeypatch.setattr(storage, "_OPTIMIZE_EVERY", 2)
+    monkeypatch.setattr(storage, "_commits_since_optimize", 0)
+    for index in range(2):
+        await storage.save_event("alpha", "console_read", datetime.now(), {}, None)
+        assert statements.count("PRAGMA optimize") == index
+
+    await storage.close()
+    assert statements.count("PRAGMA optimize") == 2
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_save_events_inserts_batch(db_path) -> None:
+    await storage.save_events(
+        [
+            {
+                "session": "alpha",
+                "event_type": "navigate",
+                "timestamp": datetime.now(),
+                "details": {"url": "https://example.com"},
+                "reason": None,
+            },
+            {
+                "session": "alpha",
+                "event_type": "click",
+                "timestamp": datetime.now(),
+                "details": None,
+                "reason": "testing",
+            },
+        ]
+    )
+
+    events = await storage.load_events("alpha")
+    assert [event["event_type"] for event in events] == ["navigate", "click"]
+    assert events[1]["details"] == {}
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_iter_events_streams_in_order(db_path) -> None:
+    await storage.save_events(
+        [
+            {
+                "session": "alpha",
+                "event_type": "console_read",
+                "timestamp": datetime.now(),
+                "details": {"index": index},
+                "reason": None,
+            }
+            for index in range(3)
+        ]
+    )
+
+    indexes = [
+        event["details"]["index"] async for event in storage.iter_events("alpha")
+    ]
+    assert indexes == [0, 1, 2]
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_details_stored_as_blob_and_legacy_text_still_loads(db_path) -> None:
+    await storage.save_event(
+        session="alpha",
+        event_type="type",
+        timestamp=datetime.now(),
+        details={"text": "héllo"},
+        reason=None,
+    )
+    conn = await storage._get_conn()
+    await conn.execute(
+        storage._INSERT_EVENT_SQL,
+        ("alpha", "navigate", "2024-01-01T00:00:00", '{"url": "https://example.com"}', None),
+    )
+    await conn.commit()
+
+    async with conn.execute("SELECT typeof(details) FROM events ORDER BY id") as cursor:
+        assert [row[0] for row in await cursor.fetchall()] == ["blob", "text"]
+    events = await storage.load_events("alpha")
+    assert events[0]["details"] == {"text": "héllo"}
+    assert events[1]["details"] == {"url": "https://example.com"}
+
+
+def test_details_encoding_keeps_utf8_without_orjson(monkeypatch) -> None:
+    monkeypatch.setattr(storage, "orjson", None)
+    assert storage._encode_details({"text": "héllo"}) == '{"text":"héllo"}'.encode()
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_timestamps_stored_as_epoch_micros(db_path) -> None:
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    await storage.save_session(
+        name="alpha",
+        status="active",
+        created_at=created_at,
+        escalation_reason=None,
+        durable=True,
+    )
+    conn = await storage._get_conn()
+    async with conn.execute("SELECT typeof(created_at) FROM sessions") as cursor:
+        assert (await cursor.fetchone())[0] == "integer"
+
+    # Rows written before the switch hold ISO text
+    await conn.execute(
+        "INSERT INTO sessions (name, status, created_at) VALUES (?, ?, ?)",
+        ("legacy", "closed", "2023-01-01T08:00:00"),
+    )
+    await conn.commit()
+    assert (await storage.load_session("alpha"))["created_at"] == created_at
+    legacy = await storage.load_session("legacy")
+    assert legacy["created_at"] == datetime(2023, 1, 1, 8)